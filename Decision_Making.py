@@ -1,252 +1,536 @@
-import skfuzzy as fuzz
-import skfuzzy.control as ctrl
+import os
+
+import matplotlib
+# Use the non-interactive Agg backend (no GUI toolkit) unless a backend is requested through MPLBACKEND
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
+from numba import njit
 
-def dehumidifier_controller(sensdata):
+from Plot import render_figures
+
+@njit(cache=True)
+def trimf_vec(x, a, b, c):
     """
-    Fuzzy logic controller to determine the dehumidifier action level based on humidity levels.
-    
+    Triangular membership function generator (same results as skfuzzy's trimf).
+
     Parameters:
-    sensdata - Array of sensor readings [humidity]
+    - x: Array of universe values.
+    - a, b, c: Feet and peak of the triangle (a <= b <= c), shoulders allowed (a == b or b == c).
 
     Returns:
-    dehumidifier_action - Dehumidifier action level (0-10)
+    - y: Membership degree of each value in x (0-1).
     """
 
-    # Define fuzzy variables
-    humidity = ctrl.Antecedent(np.arange(0, 101, 1), 'humidity')
-    dehumidifier = ctrl.Consequent(np.arange(-10, 11, 1), 'dehumidifier')
+    y = np.zeros(x.shape[0])
+    for i in range(x.shape[0]):
+        if x[i] == b:
+            # Peak of the triangle (also covers shoulders)
+            y[i] = 1.0
+        elif a < x[i] < b:
+            # Rising edge
+            y[i] = (x[i] - a) / (b - a)
+        elif b < x[i] < c:
+            # Falling edge
+            y[i] = (c - x[i]) / (c - b)
+    return y
+
+# Output universe shared by all controllers
+OUTPUT_UNIVERSE = np.arange(-10, 11, 1).astype(np.float64)
+
+# Output membership functions sampled on the output universe, one row per term
+DEHUMIDIFIER_MF = np.array([
+    trimf_vec(OUTPUT_UNIVERSE, -10, -10, 1),  # off
+    trimf_vec(OUTPUT_UNIVERSE, 0, 1.5, 3),    # low
+    trimf_vec(OUTPUT_UNIVERSE, 2, 10, 10),    # high
+])
+VENTILATION_MF = np.array([
+    trimf_vec(OUTPUT_UNIVERSE, -10, -10, 1),  # off
+    trimf_vec(OUTPUT_UNIVERSE, 0, 1.5, 3),    # low
+    trimf_vec(OUTPUT_UNIVERSE, 2, 10, 10),    # high
+])
+HEATING_MF = np.array([
+    trimf_vec(OUTPUT_UNIVERSE, -10, -10, 0),  # cool
+    trimf_vec(OUTPUT_UNIVERSE, -5, 0, 5),     # off
+    trimf_vec(OUTPUT_UNIVERSE, 0, 10, 10),    # on
+])
+
+def mf_slopes(term_mfs):
+    """
+    Slope of each sampled output membership function on each interval of the output universe.
 
-    # Define membership functions for humidity
-    humidity['low'] = fuzz.trimf(humidity.universe, [0, 0, 50])
-    humidity['medium'] = fuzz.trimf(humidity.universe, [45, 60, 75])
-    humidity['high'] = fuzz.trimf(humidity.universe, [70, 100, 100])
+    Parameters:
+    - term_mfs: Output membership functions sampled on OUTPUT_UNIVERSE, one row per term.
 
-    # Define membership functions for dehumidifier
-    dehumidifier['off'] = fuzz.trimf(dehumidifier.universe, [-10, -10, 1])
-    dehumidifier['low'] = fuzz.trimf(dehumidifier.universe, [0, 1.5, 3])
-    dehumidifier['high'] = fuzz.trimf(dehumidifier.universe, [2, 10, 10])
+    Returns:
+    - slopes: Array of shape (number of terms, len(OUTPUT_UNIVERSE) - 1).
+    """
 
-    # Define fuzzy rules
-    rule1 = ctrl.Rule(humidity['high'], dehumidifier['high'])
-    rule2 = ctrl.Rule(humidity['medium'], dehumidifier['low'])
-    rule3 = ctrl.Rule(humidity['low'], dehumidifier['off'])
+    return (term_mfs[:, 1:] - term_mfs[:, :-1]) / (OUTPUT_UNIVERSE[1:] - OUTPUT_UNIVERSE[:-1])
+
+# Output membership function slopes, used to interpolate between the samples during defuzzification
+DEHUMIDIFIER_MF_SLOPES = mf_slopes(DEHUMIDIFIER_MF)
+VENTILATION_MF_SLOPES = mf_slopes(VENTILATION_MF)
+HEATING_MF_SLOPES = mf_slopes(HEATING_MF)
+
+# Input universes (integer spaced, starting at 0)
+HUMIDITY_UNIVERSE = np.arange(0, 101, 1).astype(np.float64)
+MOISTURE_UNIVERSE = np.arange(0, 101, 1).astype(np.float64)
+TEMPERATURE_UNIVERSE = np.arange(0, 31, 1).astype(np.float64)
+
+# High humidity term, shared by the dehumidifier and ventilation controllers
+HUMIDITY_HIGH_MF = trimf_vec(HUMIDITY_UNIVERSE, 70, 100, 100)
+
+# Input membership function lookup tables, one row per term
+DEHUMIDIFIER_HUMIDITY_MF = np.array([
+    trimf_vec(HUMIDITY_UNIVERSE, 0, 0, 50),      # low
+    trimf_vec(HUMIDITY_UNIVERSE, 45, 60, 75),    # medium
+    HUMIDITY_HIGH_MF,                            # high
+])
+VENTILATION_HUMIDITY_MF = np.array([
+    trimf_vec(HUMIDITY_UNIVERSE, 0, 0, 60),      # low
+    trimf_vec(HUMIDITY_UNIVERSE, 55, 65, 75),    # medium
+    HUMIDITY_HIGH_MF,                            # high
+])
+VENTILATION_MOISTURE_MF = np.array([
+    trimf_vec(MOISTURE_UNIVERSE, 0, 0, 15),      # low
+    trimf_vec(MOISTURE_UNIVERSE, 10, 15, 20),    # medium
+    trimf_vec(MOISTURE_UNIVERSE, 15, 100, 100),  # high
+])
+HEATING_TEMPERATURE_MF = np.array([
+    trimf_vec(TEMPERATURE_UNIVERSE, 0, 0, 19),   # cold
+    trimf_vec(TEMPERATURE_UNIVERSE, 18, 20, 22), # medium
+    trimf_vec(TEMPERATURE_UNIVERSE, 21, 30, 30), # hot
+])
+
+# Temperature terms shown by plot_mf (wider than the heating controller terms)
+PLOT_TEMPERATURE_MF = np.array([
+    trimf_vec(TEMPERATURE_UNIVERSE, 0, 0, 21),     # cold
+    trimf_vec(TEMPERATURE_UNIVERSE, 20, 22.5, 25), # medium
+    trimf_vec(TEMPERATURE_UNIVERSE, 24, 30, 30),   # hot
+])
+
+# Rule matrices: one row per rule, the antecedent term index of each input followed by the consequent term index
+DEHUMIDIFIER_RULES = np.array([
+    [2, 2],  # humidity high -> high
+    [1, 1],  # humidity medium -> low
+    [0, 0],  # humidity low -> off
+], dtype=np.int8)
+VENTILATION_RULES = np.array([
+    [2, 2, 2],  # humidity high & moisture high -> high
+    [2, 1, 2],  # humidity high & moisture medium -> high
+    [2, 0, 2],  # humidity high & moisture low -> high
+    [1, 2, 2],  # humidity medium & moisture high -> high
+    [1, 1, 1],  # humidity medium & moisture medium -> low
+    [0, 2, 2],  # humidity low & moisture high -> high
+    [1, 0, 1],  # humidity medium & moisture low -> low
+    [0, 1, 1],  # humidity low & moisture medium -> low
+    [0, 0, 0],  # humidity low & moisture low -> off
+], dtype=np.int8)
+HEATING_RULES = np.array([
+    [2, 0],  # temperature hot -> cool
+    [1, 1],  # temperature medium -> off
+    [0, 2],  # temperature cold -> on
+], dtype=np.int8)
+
+# The universes and tables are shared by all controllers and plots, mark them read-only
+for _array in (OUTPUT_UNIVERSE, DEHUMIDIFIER_MF, VENTILATION_MF, HEATING_MF,
+               DEHUMIDIFIER_MF_SLOPES, VENTILATION_MF_SLOPES, HEATING_MF_SLOPES,
+               HUMIDITY_UNIVERSE, MOISTURE_UNIVERSE, TEMPERATURE_UNIVERSE, HUMIDITY_HIGH_MF,
+               DEHUMIDIFIER_HUMIDITY_MF, VENTILATION_HUMIDITY_MF, VENTILATION_MOISTURE_MF, HEATING_TEMPERATURE_MF,
+               PLOT_TEMPERATURE_MF, DEHUMIDIFIER_RULES, VENTILATION_RULES, HEATING_RULES):
+    _array.setflags(write=False)
+del _array
+
+@njit(cache=True)
+def mf_position(x, last):
+    """
+    Locate x in a membership function lookup table tabulated on the integer universe 0, 1, ..., last.
+
+    x is clipped to the universe. The position can be reused to look up every term of the same input.
 
-    # Create control system
-    dehumidifier_ctrl = ctrl.ControlSystem([rule1, rule2, rule3])
-    dehumidifier_sim = ctrl.ControlSystemSimulation(dehumidifier_ctrl)
+    Parameters:
+    - x: The input value.
+    - last: Last value of the universe.
+
+    Returns:
+    - k: Index of the table entry at or below x.
+    - frac: Fraction of the way from entry k to entry k + 1 (0 <= frac < 1).
+    """
 
-    dehumidifier_sim.input['humidity'] = sensdata[1]
+    if x <= 0.0:
+        return 0, 0.0
+    if x >= last:
+        return last, 0.0
+    k = int(x)
+    return k, x - k
 
-    # Compute the output
-    dehumidifier_sim.compute()
+@njit(cache=True)
+def interp_mf_at(mf, k, frac):
+    """
+    Look up a membership degree at a table position from mf_position.
 
-    # Get the output value
-    dehumidifier_action = dehumidifier_sim.output['dehumidifier']
+    Values between table entries are linearly interpolated (like skfuzzy).
 
-    return dehumidifier_action
+    Parameters:
+    - mf: Membership function lookup table.
+    - k, frac: Position in the table (see mf_position).
 
-def ventilation_controller(sensdata):
+    Returns:
+    - membership: Membership degree (0-1).
     """
-    Fuzzy logic controller to determine the ventilation action level based on humidity and moisture levels.
-    
+
+    if frac == 0.0:
+        return mf[k]
+    return (mf[k + 1] - mf[k]) * frac + mf[k]
+
+@njit(cache=True)
+def _aggregate(term_mfs, term_slopes, cuts, k, x):
+    # Maximum over the clipped output terms at x, interpolated inside [universe[k], universe[k+1]] like np.interp
+    agg = 0.0
+    for j in range(term_mfs.shape[0]):
+        if x == OUTPUT_UNIVERSE[k + 1]:
+            mf = term_mfs[j, k + 1]
+        else:
+            mf = term_slopes[j, k] * (x - OUTPUT_UNIVERSE[k]) + term_mfs[j, k]
+        agg = max(agg, min(cuts[j], mf))
+    return agg
+
+@njit(cache=True)
+def mamdani_centroid(term_mfs, term_slopes, cuts):
+    """
+    Clip each output term at its rule strength, aggregate with max and defuzzify with the centroid method.
+
+    Like skfuzzy, the output universe is refined at the points where each term crosses its cut level,
+    and the centroid of the resulting piecewise-linear shape is returned.
+
     Parameters:
-    sensdata - Array of sensor readings [humidity, moisture]
+    - term_mfs: Output membership functions sampled on OUTPUT_UNIVERSE, one row per term.
+    - term_slopes: Slopes of the output membership functions (see mf_slopes).
+    - cuts: Activation level of each output term.
 
     Returns:
-    ventilation_action - Ventilation action level (0-10)
+    - crisp_value: The defuzzified output value.
+    """
+
+    num_terms = term_mfs.shape[0]
+    points = np.empty(num_terms + 2)
+    sum_moment_area = 0.0
+    sum_area = 0.0
+
+    # Aggregated membership at the start of the current universe interval
+    y_start = _aggregate(term_mfs, term_slopes, cuts, 0, OUTPUT_UNIVERSE[0])
+
+    for k in range(OUTPUT_UNIVERSE.shape[0] - 1):
+        # Collect the sorted breakpoints inside the current universe interval
+        points[0] = OUTPUT_UNIVERSE[k]
+        count = 1
+        for j in range(num_terms):
+            m1 = term_mfs[j, k]
+            m2 = term_mfs[j, k + 1]
+            if (m1 - cuts[j]) * (m2 - cuts[j]) < 0.0:
+                x = OUTPUT_UNIVERSE[k] + (cuts[j] - m1) * (OUTPUT_UNIVERSE[k + 1] - OUTPUT_UNIVERSE[k]) / (m2 - m1)
+                p = count
+                while p > 1 and points[p - 1] > x:
+                    points[p] = points[p - 1]
+                    p -= 1
+                points[p] = x
+                count += 1
+        points[count] = OUTPUT_UNIVERSE[k + 1]
+        count += 1
+
+        # Accumulate area and moment of each linear piece (trapezoid)
+        x1 = points[0]
+        y1 = y_start
+        for p in range(1, count):
+            x2 = points[p]
+            y2 = _aggregate(term_mfs, term_slopes, cuts, k, x2)
+            if x2 > x1 and not (y1 == 0.0 and y2 == 0.0):
+                if y1 == y2:
+                    # Rectangle
+                    moment = 0.5 * (x1 + x2)
+                    area = (x2 - x1) * y1
+                elif y1 == 0.0:
+                    # Triangle, height y2
+                    moment = 2.0 / 3.0 * (x2 - x1) + x1
+                    area = 0.5 * (x2 - x1) * y2
+                elif y2 == 0.0:
+                    # Triangle, height y1
+                    moment = 1.0 / 3.0 * (x2 - x1) + x1
+                    area = 0.5 * (x2 - x1) * y1
+                else:
+                    moment = 2.0 / 3.0 * (x2 - x1) * (y2 + 0.5 * y1) / (y1 + y2) + x1
+                    area = 0.5 * (x2 - x1) * (y1 + y2)
+                sum_moment_area += moment * area
+                sum_area += area
+            x1 = x2
+            y1 = y2
+
+        # The end of this interval is the start of the next one
+        y_start = y1
+
+    return sum_moment_area / max(sum_area, np.finfo(np.float64).eps)
+
+@njit(cache=True)
+def _dehumidifier_output(h_k, h_frac, h_high):
+    # Dehumidifier inference from the humidity table position and the shared high humidity membership
+    h_low = interp_mf_at(DEHUMIDIFIER_HUMIDITY_MF[0], h_k, h_frac)
+    h_medium = interp_mf_at(DEHUMIDIFIER_HUMIDITY_MF[1], h_k, h_frac)
+
+    # Rule strengths for [off, low, high]
+    cuts = np.array([h_low, h_medium, h_high])
+    return mamdani_centroid(DEHUMIDIFIER_MF, DEHUMIDIFIER_MF_SLOPES, cuts)
+
+@njit(cache=True)
+def _ventilation_output(h_k, h_frac, h_high, moisture):
+    # Ventilation inference from the humidity table position and the shared high humidity membership
+    h_low = interp_mf_at(VENTILATION_HUMIDITY_MF[0], h_k, h_frac)
+    h_medium = interp_mf_at(VENTILATION_HUMIDITY_MF[1], h_k, h_frac)
+
+    # Membership degrees for moisture
+    m_k, m_frac = mf_position(moisture, MOISTURE_UNIVERSE.shape[0] - 1)
+    m_low = interp_mf_at(VENTILATION_MOISTURE_MF[0], m_k, m_frac)
+    m_medium = interp_mf_at(VENTILATION_MOISTURE_MF[1], m_k, m_frac)
+    m_high = interp_mf_at(VENTILATION_MOISTURE_MF[2], m_k, m_frac)
+
+    # Rule strengths for [off, low, high] (AND is min, rules sharing a consequent are combined with max)
+    off = min(h_low, m_low)
+    low = max(min(h_medium, m_medium), min(h_medium, m_low), min(h_low, m_medium))
+    high = max(min(h_high, m_high), min(h_high, m_medium), min(h_high, m_low),
+               min(h_medium, m_high), min(h_low, m_high))
+    cuts = np.array([off, low, high])
+    return mamdani_centroid(VENTILATION_MF, VENTILATION_MF_SLOPES, cuts)
+
+@njit(cache=True)
+def dehumidifier_kernel(humidity):
+    h_k, h_frac = mf_position(humidity, HUMIDITY_UNIVERSE.shape[0] - 1)
+    h_high = interp_mf_at(HUMIDITY_HIGH_MF, h_k, h_frac)
+    return _dehumidifier_output(h_k, h_frac, h_high)
+
+@njit(cache=True)
+def ventilation_kernel(humidity, moisture):
+    h_k, h_frac = mf_position(humidity, HUMIDITY_UNIVERSE.shape[0] - 1)
+    h_high = interp_mf_at(HUMIDITY_HIGH_MF, h_k, h_frac)
+    return _ventilation_output(h_k, h_frac, h_high, moisture)
+
+@njit(cache=True)
+def humidity_kernels(humidity, moisture):
+    """
+    Dehumidifier and ventilation action levels for the same readings, locating humidity in the
+    lookup tables and evaluating the shared high humidity term only once.
+
+    Parameters:
+    - humidity: Humidity reading.
+    - moisture: Moisture reading.
+
+    Returns:
+    - dehumidifier_action: Dehumidifier action level (same as dehumidifier_kernel).
+    - ventilation_action: Ventilation action level (same as ventilation_kernel).
+    """
+
+    h_k, h_frac = mf_position(humidity, HUMIDITY_UNIVERSE.shape[0] - 1)
+    h_high = interp_mf_at(HUMIDITY_HIGH_MF, h_k, h_frac)
+    return _dehumidifier_output(h_k, h_frac, h_high), _ventilation_output(h_k, h_frac, h_high, moisture)
+
+@njit(cache=True)
+def heating_kernel(temperature):
+    # Membership degrees for temperature
+    t_k, t_frac = mf_position(temperature, TEMPERATURE_UNIVERSE.shape[0] - 1)
+    t_cold = interp_mf_at(HEATING_TEMPERATURE_MF[0], t_k, t_frac)
+    t_medium = interp_mf_at(HEATING_TEMPERATURE_MF[1], t_k, t_frac)
+    t_hot = interp_mf_at(HEATING_TEMPERATURE_MF[2], t_k, t_frac)
+
+    # Rule strengths for [cool, off, on]
+    cuts = np.array([t_hot, t_medium, t_cold])
+    return mamdani_centroid(HEATING_MF, HEATING_MF_SLOPES, cuts)
+
+def batch_centroid(term_mfs, cuts):
+    """
+    Vectorized version of mamdani_centroid for many sets of rule strengths at once.
+
+    Parameters:
+    - term_mfs: Output membership functions sampled on OUTPUT_UNIVERSE, one row per term.
+    - cuts: Activation level of each output term, shape (N, number of terms).
+
+    Returns:
+    - crisp_values: The defuzzified output values, shape (N,).
     """
 
-    # Define fuzzy variables
-    humidity = ctrl.Antecedent(np.arange(0, 101, 1), 'humidity')
-    moisture = ctrl.Antecedent(np.arange(0, 101, 1), 'moisture')
-    ventilation = ctrl.Consequent(np.arange(-10, 11, 1), 'ventilation')
+    universe = OUTPUT_UNIVERSE
+    n = cuts.shape[0]
+    last = universe.shape[0] - 1
+
+    # Points where each term crosses its cut level inside each universe interval (NaN if it does not)
+    m1 = term_mfs[:, :-1]
+    m2 = term_mfs[:, 1:]
+    c = cuts[:, :, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossings = universe[:-1] + (c - m1) * (universe[1:] - universe[:-1]) / (m2 - m1)
+    crossings = np.where((m1 - c) * (m2 - c) < 0.0, crossings, np.nan)
+
+    # Refined universe for every sample, sorted with the unused (NaN) points at the end
+    points = np.concatenate([np.broadcast_to(universe, (n, universe.shape[0])), crossings.reshape(n, -1)], axis=1)
+    points.sort(axis=1)
+
+    # Aggregated output membership at every point (maximum over the clipped terms)
+    valid = ~np.isnan(points)
+    x = np.where(valid, points, universe[0])
+    k = np.clip(np.floor(x - universe[0]).astype(np.intp), 0, last - 1)
+    slopes = mf_slopes(term_mfs)
+    mf = np.where(x == universe[last], term_mfs[:, last, np.newaxis, np.newaxis], slopes[:, k] * (x - universe[k]) + term_mfs[:, k])
+    agg = np.minimum(cuts.T[:, :, np.newaxis], mf).max(axis=0)
+
+    # Area and moment of each linear piece (trapezoid)
+    x1, x2 = x[:, :-1], x[:, 1:]
+    y1, y2 = agg[:, :-1], agg[:, 1:]
+    width = x2 - x1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moment = np.where(y1 == y2, 0.5 * (x1 + x2),
+                 np.where(y1 == 0.0, 2.0 / 3.0 * width + x1,
+                 np.where(y2 == 0.0, 1.0 / 3.0 * width + x1,
+                          2.0 / 3.0 * width * (y2 + 0.5 * y1) / (y1 + y2) + x1)))
+    area = np.where(valid[:, 1:] & (width > 0.0), 0.5 * width * (y1 + y2), 0.0)
+
+    return (moment * area).sum(axis=1) / np.fmax(area.sum(axis=1), np.finfo(np.float64).eps)
+
+def batch_inference(inputs, input_mfs, rules, output_mfs):
+    """
+    Evaluate a Mamdani fuzzy system for all samples at once with array operations.
 
-    # Define membership functions for humidity
-    humidity['low'] = fuzz.trimf(humidity.universe, [0, 0, 60])
-    humidity['medium'] = fuzz.trimf(humidity.universe, [55, 65, 75])
-    humidity['high'] = fuzz.trimf(humidity.universe, [70, 100, 100])
+    Only usable when the inputs do not depend on earlier outputs (open loop).
 
-    # Define membership functions for moisture
-    moisture['low'] = fuzz.trimf(moisture.universe, [0, 0, 15])
-    moisture['medium'] = fuzz.trimf(moisture.universe, [10, 15, 20])
-    moisture['high'] = fuzz.trimf(moisture.universe, [15, 100, 100])
+    Parameters:
+    - inputs: List of input arrays, each of shape (N,) (a scalar is treated as a single sample).
+    - input_mfs: List of input membership function lookup tables, one per input.
+    - rules: Rule matrix, one row per rule with the antecedent term of each input and the consequent term.
+    - output_mfs: Output membership functions sampled on OUTPUT_UNIVERSE, one row per term.
 
-    # Define membership functions for ventilation
-    ventilation['off'] = fuzz.trimf(ventilation.universe, [-10, -10, 1])
-    ventilation['low'] = fuzz.trimf(ventilation.universe, [0, 1.5, 3])
-    ventilation['high'] = fuzz.trimf(ventilation.universe, [2, 10, 10])
+    Returns:
+    - crisp_values: The defuzzified output values, shape (N,).
+    """
 
-    # Define fuzzy rules
-    rule1 = ctrl.Rule(humidity['high'] & moisture['high'], ventilation['high'])
-    rule2 = ctrl.Rule(humidity['high'] & moisture['medium'], ventilation['high'])
-    rule3 = ctrl.Rule(humidity['high'] & moisture['low'], ventilation['high'])
-    rule4 = ctrl.Rule(humidity['medium'] & moisture['high'], ventilation['high'])
-    rule6 = ctrl.Rule(humidity['low'] & moisture['high'], ventilation['high'])
-    rule5 = ctrl.Rule(humidity['medium'] & moisture['medium'], ventilation['low'])
-    rule7 = ctrl.Rule(humidity['medium'] & moisture['low'], ventilation['low'])
-    rule8 = ctrl.Rule(humidity['low'] & moisture['medium'], ventilation['low'])
-    rule9 = ctrl.Rule(humidity['low'] & moisture['low'], ventilation['off'])
+    # Accept scalars as single samples, the inputs must be one-dimensional arrays of samples
+    inputs = [np.atleast_1d(np.asarray(x, dtype=np.float64)) for x in inputs]
+    if any(x.ndim != 1 for x in inputs):
+        raise ValueError("batch_inference expects one-dimensional input arrays")
+    if inputs[0].shape[0] == 0:
+        return np.empty(0)
+
+    # Rule strengths: AND (min) over the inputs of the selected antecedent terms
+    firing = None
+    for i, (x, mfs) in enumerate(zip(inputs, input_mfs)):
+        last = mfs.shape[1] - 1
+        x = np.clip(x, 0.0, last)
+        k = np.minimum(x.astype(np.intp), last - 1)
+        mu = np.where(x == last, mfs[:, last:], (mfs[:, k + 1] - mfs[:, k]) * (x - k) + mfs[:, k])
+        selected = mu[rules[:, i]]
+        firing = selected if firing is None else np.minimum(firing, selected)
+
+    # Output term strengths: rules sharing a consequent are combined with max
+    cuts = np.zeros((firing.shape[1], output_mfs.shape[0]))
+    for r in range(rules.shape[0]):
+        term = rules[r, -1]
+        cuts[:, term] = np.maximum(cuts[:, term], firing[r])
+
+    return batch_centroid(output_mfs, cuts)
+
+def fuzzy_batch_dehumidifier(humidity):
+    """Dehumidifier action levels for an array of humidity readings (see dehumidifier_controller)."""
+    return batch_inference([humidity], [DEHUMIDIFIER_HUMIDITY_MF], DEHUMIDIFIER_RULES, DEHUMIDIFIER_MF)
+
+def fuzzy_batch_ventilation(humidity, moisture):
+    """Ventilation action levels for arrays of humidity and moisture readings (see ventilation_controller)."""
+    return batch_inference([humidity, moisture], [VENTILATION_HUMIDITY_MF, VENTILATION_MOISTURE_MF],
+                           VENTILATION_RULES, VENTILATION_MF)
+
+def fuzzy_batch_heating(temperature):
+    """Heating action levels for an array of temperature readings (see heating_controller)."""
+    return batch_inference([temperature], [HEATING_TEMPERATURE_MF], HEATING_RULES, HEATING_MF)
 
-    # Create control system
-    ventilation_ctrl = ctrl.ControlSystem([rule1, rule2, rule3, rule4, rule5, rule6, rule7, rule8, rule9])
-    ventilation_sim = ctrl.ControlSystemSimulation(ventilation_ctrl)
+def dehumidifier_controller(sensdata):
+    """
+    Fuzzy logic controller to determine the dehumidifier action level based on humidity levels.
+    
+    Parameters:
+    sensdata - Sensor readings [temperature, humidity, moisture] as a tuple or array (only humidity is used)
+
+    Returns:
+    dehumidifier_action - Dehumidifier action level (0-10)
+    """
 
-    ventilation_sim.input['humidity'] = sensdata[1]
-    ventilation_sim.input['moisture'] = sensdata[2]
+    return dehumidifier_kernel(sensdata[1])
+
+def ventilation_controller(sensdata):
+    """
+    Fuzzy logic controller to determine the ventilation action level based on humidity and moisture levels.
+    
+    Parameters:
+    sensdata - Sensor readings [temperature, humidity, moisture] as a tuple or array (humidity and moisture are used)
 
-    # Compute the output
-    ventilation_sim.compute()
+    Returns:
+    ventilation_action - Ventilation action level (0-10)
+    """
 
-    # Get the output value
-    ventilation_action = ventilation_sim.output['ventilation']
-    return ventilation_action
+    return ventilation_kernel(sensdata[1], sensdata[2])
 
 def heating_controller(sensdata):
     """
     Fuzzy logic controller to determine the heating action level based on temperature levels.
     
     Parameters:
-    sensdata - Array of sensor readings [temperature, humidity]
+    sensdata - Sensor readings [temperature, humidity, moisture] as a tuple or array (only temperature is used)
     
     Returns:
     heating_action - Heating action level (-10-10)
     """
 
-    # Define fuzzy variables
-    temperature = ctrl.Antecedent(np.arange(0, 31, 1), 'temperature')
-    heating = ctrl.Consequent(np.arange(-10, 11, 1), 'heating')
-
-    # Define membership functions for temperature
-    temperature['cold'] = fuzz.trimf(temperature.universe, [0, 0, 19])
-    temperature['medium'] = fuzz.trimf(temperature.universe, [18, 20, 22])
-    temperature['hot'] = fuzz.trimf(temperature.universe, [21, 30, 30])
-
-    # Define membership functions for heating
-    heating['cool'] = fuzz.trimf(heating.universe, [-10, -10, 0])
-    heating['off'] = fuzz.trimf(heating.universe, [-5, 0, 5])
-    heating['on'] = fuzz.trimf(heating.universe, [0, 10, 10])
-
-    # Define fuzzy rules
-    rule1 = ctrl.Rule(temperature['hot'], heating['cool'])
-    rule2 = ctrl.Rule(temperature['medium'], heating['off'])
-    rule3 = ctrl.Rule(temperature['cold'], heating['on'])
-
-    # Create control system
-    heating_ctrl = ctrl.ControlSystem([rule1, rule2, rule3])
-    heating_sim = ctrl.ControlSystemSimulation(heating_ctrl)
-
-    heating_sim.input['temperature'] = sensdata[0]
-
-    # Compute the output
-    heating_sim.compute()
-
-    # Get the output value
-    heating_action = heating_sim.output['heating']
-    return heating_action
-
-def plot_mf():
-    # Define fuzzy variables
-    temperature = ctrl.Antecedent(np.arange(0, 31, 1), 'temperature')
-    humidity = ctrl.Antecedent(np.arange(0, 101, 1), 'humidity')
-    moisture = ctrl.Antecedent(np.arange(0, 101, 1), 'moisture')
-    heating = ctrl.Consequent(np.arange(-10, 11, 1), 'heating')
-    dehumidifier = ctrl.Consequent(np.arange(-10, 11, 1), 'dehumidifier')
-    ventilation = ctrl.Consequent(np.arange(-10, 11, 1), 'ventilation')
-
-    # Define membership functions for temperature
-    temperature['cold'] = fuzz.trimf(temperature.universe, [0, 0, 21])
-    temperature['medium'] = fuzz.trimf(temperature.universe, [20, 22.5, 25])
-    temperature['hot'] = fuzz.trimf(temperature.universe, [24, 30, 30])
-
-    # Define membership functions for humidity
-    humidity['low'] = fuzz.trimf(humidity.universe, [0, 0, 60])
-    humidity['medium'] = fuzz.trimf(humidity.universe, [55, 65, 75])
-    humidity['high'] = fuzz.trimf(humidity.universe, [70, 100, 100])
-
-    # Define membership functions for moisture
-    moisture['low'] = fuzz.trimf(moisture.universe, [0, 0, 15])
-    moisture['medium'] = fuzz.trimf(moisture.universe, [10, 15, 20])
-    moisture['high'] = fuzz.trimf(moisture.universe, [15, 100, 100])
-
-    # Define membership functions for heating
-    heating['cool'] = fuzz.trimf(heating.universe, [-10, -10, 0])
-    heating['off'] = fuzz.trimf(heating.universe, [-5, 0, 5])
-    heating['on'] = fuzz.trimf(heating.universe, [0, 10, 10])
-
-    # Define membership functions for dehumidifier
-    dehumidifier['off'] = fuzz.trimf(dehumidifier.universe, [-10, -10, 1])
-    dehumidifier['low'] = fuzz.trimf(dehumidifier.universe, [0, 1.5, 3])
-    dehumidifier['high'] = fuzz.trimf(dehumidifier.universe, [2, 10, 10])
-
-    # Define membership functions for ventilation
-    ventilation['off'] = fuzz.trimf(ventilation.universe, [-10, -10, 1])
-    ventilation['low'] = fuzz.trimf(ventilation.universe, [0, 1.5, 3])
-    ventilation['high'] = fuzz.trimf(ventilation.universe, [2, 10, 10])
-
-    # Plot the membership functions for temperature
-    plt.plot(temperature.universe, temperature['cold'].mf, label='Cold')
-    plt.plot(temperature.universe, temperature['medium'].mf, label='Medium')
-    plt.plot(temperature.universe, temperature['hot'].mf, label='Hot')
-    plt.title('Temperature Membership Functions')
-    plt.xlabel('Temperature (°C)')
-    plt.ylabel('Membership Degree')
-    plt.legend()
-    plt.savefig('mf_temperature.pdf', format='pdf', dpi=300)
-    plt.show()
-
-    # Plot the membership functions for humidity
-    plt.plot(humidity.universe, humidity['low'].mf, label='Low')
-    plt.plot(humidity.universe, humidity['medium'].mf, label='Medium')
-    plt.plot(humidity.universe, humidity['high'].mf, label='High')
-    plt.title('Humidity Membership Functions')
-    plt.xlabel('Humidity (%)')
-    plt.ylabel('Membership Degree')
-    plt.legend()
-    plt.savefig('mf_humidity.pdf', format='pdf', dpi=300)
-    plt.show()
-
-    # Plot the membership functions for moisture
-    plt.plot(moisture.universe, moisture['low'].mf, label='Low')
-    plt.plot(moisture.universe, moisture['medium'].mf, label='Medium')
-    plt.plot(moisture.universe, moisture['high'].mf, label='High')
-    plt.title('Moisture Membership Functions')
-    plt.xlabel('Moisture Level')
-    plt.ylabel('Membership Degree')
-    plt.legend()
-    plt.savefig('mf_moisture.pdf', format='pdf', dpi=300)
-    plt.show()
-
-    # Plot the membership functions for heating action
-    plt.plot(heating.universe, heating['cool'].mf, label='Cool')
-    plt.plot(heating.universe, heating['off'].mf, label='Off')
-    plt.plot(heating.universe, heating['on'].mf, label='On')
-    plt.title('Heating Action Membership Functions')
-    plt.xlabel('Heating Action Level')
-    plt.ylabel('Membership Degree')
-    plt.legend()
-    plt.savefig('mf_heating.pdf', format='pdf', dpi=300)
-    plt.show()
-
-    # Plot the membership functions for dehumidifier action
-    plt.plot(dehumidifier.universe, dehumidifier['off'].mf, label='Off')
-    plt.plot(dehumidifier.universe, dehumidifier['low'].mf, label='Low')
-    plt.plot(dehumidifier.universe, dehumidifier['high'].mf, label='High')
-    plt.title('Dehumidifier Action Membership Functions')
-    plt.xlabel('Dehumidifier Action Level')
-    plt.ylabel('Membership Degree')
-    plt.legend()
-    plt.savefig('mf_dehumidifier.pdf', format='pdf', dpi=300)
-    plt.show()
-
-    # Plot the membership functions for ventilation action
-    plt.plot(ventilation.universe, ventilation['off'].mf, label='Off')
-    plt.plot(ventilation.universe, ventilation['low'].mf, label='Low')
-    plt.plot(ventilation.universe, ventilation['high'].mf, label='High')
-    plt.title('Ventilation Action Membership Functions')
-    plt.xlabel('Ventilation Action Level')
+    return heating_kernel(sensdata[0])
+
+def _render_mf(title, xlabel, universe, mfs, filename, show=False):
+    # Plot the membership functions of one fuzzy variable and save them as a PDF
+    fig = plt.figure()
+    for label, mf in mfs:
+        plt.plot(universe, mf, label=label)
+    plt.title(title)
+    plt.xlabel(xlabel)
     plt.ylabel('Membership Degree')
     plt.legend()
-    plt.savefig('mf_ventilation.pdf', format='pdf', dpi=300)
-    plt.show()
+    plt.savefig(filename, format='pdf', dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def plot_mf(show=False, parallel=False):
+    """
+    Plot the membership functions of all fuzzy variables and save each plot as a PDF.
+
+    Parameters:
+    - show: Also display each plot (requires an interactive backend, e.g. through MPLBACKEND).
+      The plots are then rendered one by one in the current process.
+    - parallel: Render the plots in parallel processes when they are not shown (default is False, see render_figures).
+    """
+
+    # Title, x-axis label, universe, membership functions and filename of each plot
+    # (the membership functions are the tables computed once at import)
+    figures = [
+        ('Temperature Membership Functions', 'Temperature (°C)', TEMPERATURE_UNIVERSE,
+         list(zip(['Cold', 'Medium', 'Hot'], PLOT_TEMPERATURE_MF)), 'mf_temperature.pdf'),
+        ('Humidity Membership Functions', 'Humidity (%)', HUMIDITY_UNIVERSE,
+         list(zip(['Low', 'Medium', 'High'], VENTILATION_HUMIDITY_MF)), 'mf_humidity.pdf'),
+        ('Moisture Membership Functions', 'Moisture Level', MOISTURE_UNIVERSE,
+         list(zip(['Low', 'Medium', 'High'], VENTILATION_MOISTURE_MF)), 'mf_moisture.pdf'),
+        ('Heating Action Membership Functions', 'Heating Action Level', OUTPUT_UNIVERSE,
+         list(zip(['Cool', 'Off', 'On'], HEATING_MF)), 'mf_heating.pdf'),
+        ('Dehumidifier Action Membership Functions', 'Dehumidifier Action Level', OUTPUT_UNIVERSE,
+         list(zip(['Off', 'Low', 'High'], DEHUMIDIFIER_MF)), 'mf_dehumidifier.pdf'),
+        ('Ventilation Action Membership Functions', 'Ventilation Action Level', OUTPUT_UNIVERSE,
+         list(zip(['Off', 'Low', 'High'], VENTILATION_MF)), 'mf_ventilation.pdf'),
+    ]
+
+    if show:
+        # Render and display the plots one by one
+        for figure in figures:
+            _render_mf(*figure, show=True)
+    else:
+        render_figures(_render_mf, *zip(*figures), parallel=parallel)
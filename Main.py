@@ -45,74 +45,48 @@ moisture_action_factor = 0.05
 rain_probability = 0.2
 rain_intensity = 1
 
-def main():
+# Simulation Parameters
+simulation_dtype = np.float64  # Floating point type of the simulated data and action arrays (float32 halves their size)
+control_period = 1  # Number of time points between controller evaluations
+random_seed = None  # Seed of the random draws for a reproducible run (None for different draws every run)
+
+def main(seed=random_seed, rng=None):
+    """
+    Run the simulation, plot the results and print the rise times and stability.
+
+    Parameters:
+    - seed: Seed of the random generator used if no generator is given (None for different draws every run).
+    - rng: Random generator (np.random.Generator) for the rain and the noise of all signals.
+    """
+
+    # All random draws come from one generator, so a seed reproduces the whole run
+    rng = np.random.default_rng(seed) if rng is None else rng
+
     # Generate time data with a 24-hour duration and 2-minute resolution
     time = generate_time_vector(24, 2)
 
     # Generate rain data with specified probability and intensity
-    rain_data = generate_rain_vector(time, rain_probability=rain_probability, intensity=rain_intensity)
+    rain_data = generate_rain_vector(time, rain_probability=rain_probability, intensity=rain_intensity, rng=rng)
 
     # Base functions to simulate temperature, humidity, and moisture with noise
     temperature_base, temperature_noise, _ = simulate_temperature(
-        time, base_temp=base_temp, amplitude=temperature_amplitude, noise_level=temperature_noise_level)
+        time, base_temp=base_temp, amplitude=temperature_amplitude, noise_level=temperature_noise_level,
+        dtype=simulation_dtype, rng=rng)
     humidity_base, humidity_noise, _ = simulate_humidity(
         time, rain_data, base_humidity=base_humidity, amplitude=humidity_amplitude, rain_impact=humidity_rain_impact,
         drying_speed=humidity_drying_speed, noise_level=humidity_noise_level, spike_chance=humidity_spike_chance,
-        spike_value=humidity_spike_value)
+        spike_value=humidity_spike_value, dtype=simulation_dtype, rng=rng)
     moisture_base, moisture_noise, _ = simulate_moisture(
         time, rain_data, base_moisture=base_moisture, rain_impact=moisture_rain_impact, drying_speed=moisture_drying_speed,
-        noise_level=moisture_noise_level)
-    
-    # Initialize updated data arrays with base data values
-    temperature_updated = np.copy(temperature_base)
-    humidity_updated = np.copy(humidity_base)
-    moisture_updated = np.copy(moisture_base)
-
-    # Initialize action level arrays for dehumidifier, ventilation, and heating
-    dehumidifier_action = np.zeros_like(time)
-    ventilation_action = np.zeros_like(time)
-    heating_action = np.zeros_like(time)
-
-    # Loop over each time point to update and apply actions
-    for i in range(len(time)):
-        time_stamp = i
-
-        if time_stamp > 0:
-            # Update temperature, humidity, and moisture with actions and decay
-            temperature_updated[i] = update_temperature(
-                time_stamp, temperature_base, temperature_updated, heating_action[i - 1],
-                min_limit=temperature_min_limit, max_limit=temperature_max_limit,
-                decay_rate=temperature_decay_rate, action_factor=temperature_action_factor)
-            humidity_updated[i] = update_humidity(
-                time_stamp, humidity_base, humidity_updated, dehumidifier_action[i - 1], ventilation_action[i - 1],
-                min_limit=humidity_min_limit, decay_rate=humidity_decay_rate, action_factor=humidity_action_factor)
-            moisture_updated[i] = update_moisture(
-                time_stamp, moisture_base, moisture_updated, ventilation_action[i - 1],
-                min_limit=moisture_min_limit, decay_rate=moisture_decay_rate, action_factor=moisture_action_factor)
-
-        # Add noise to the updated data
-        noisy_temperature = temperature_updated + temperature_noise
-        noisy_humidity = humidity_updated + humidity_noise
-        noisy_moisture = moisture_updated + moisture_noise
-
-        # Smooth noisy data for temperature, humidity, and moisture
-        temperature = smooth_data(time_stamp, noisy_temperature)
-        humidity = smooth_data(time_stamp, noisy_humidity)
-        moisture = smooth_data(time_stamp, noisy_moisture)
-
-        # Sensor data array for controllers
-        sensdata = [temperature, humidity, moisture]
-
-        if i % 1 == 0:
-            # Determine actions for dehumidifier, ventilation, and heating based on sensor data (allows to run actions at larger intervals)
-            dehumidifier_action[i] = dehumidifier_controller(sensdata)
-            ventilation_action[i] = ventilation_controller(sensdata)
-            heating_action[i] = heating_controller(sensdata)
-        else:
-            # Maintain the previous action level
-            dehumidifier_action[i] = dehumidifier_action[i - 1]
-            ventilation_action[i] = ventilation_action[i - 1]
-            heating_action[i] = heating_action[i - 1]
+        noise_level=moisture_noise_level, dtype=simulation_dtype, rng=rng)
+
+    # Run the closed-loop simulation, updating the data and applying actions at each time point
+    (temperature_updated, humidity_updated, moisture_updated,
+     dehumidifier_action, ventilation_action, heating_action) = simulate_loop(
+        temperature_base, humidity_base, moisture_base, temperature_noise, humidity_noise, moisture_noise,
+        temperature_min_limit, temperature_max_limit, temperature_decay_rate, temperature_action_factor,
+        humidity_min_limit, humidity_decay_rate, humidity_action_factor,
+        moisture_min_limit, moisture_decay_rate, moisture_action_factor, control_period=control_period)
 
     # Organize action levels and labels for plotting
     action_levels = np.array([dehumidifier_action, ventilation_action, heating_action])
@@ -124,9 +98,9 @@ def main():
     noise_data = [temperature_noise + temperature_base, humidity_noise + humidity_base, moisture_noise + moisture_base]
     labels = ['Temperature', 'Humidity', 'Moisture']
 
-    # Plot action levels and updated sensor data
-    plot_actions(time, action_levels, action_labels)
-    plot_updated(time, updated_data, base_data, noise_data, labels)
+    # Plot action levels and updated sensor data (in parallel processes, the entry point below is guarded)
+    plot_actions(time, action_levels, action_labels, parallel=True)
+    plot_updated(time, updated_data, base_data, noise_data, labels, parallel=True)
 
     # Calculate rise times and stability for temperature, humidity, and moisture
     rise_temperature = time[(temperature_updated <= 22) & (temperature_updated >= 18)]
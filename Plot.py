@@ -1,7 +1,78 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+# Use the non-interactive Agg backend (no GUI toolkit) unless a backend is requested through MPLBACKEND
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('Agg')
 import numpy as np
 import matplotlib.pyplot as plt
 
-def plot_actions(time, action_levels, labels=None):
+def use_agg_backend():
+    """
+    Switch matplotlib to the non-interactive Agg backend (used to initialize plotting worker processes).
+    """
+
+    matplotlib.use('Agg')
+
+def _pool_context():
+    # Forking while Numba's parallel thread pool is running can deadlock the workers, so only then start them from a
+    # clean server process (the pool is launched by parallel kernels such as the batch simulators). Otherwise use the
+    # platform's default start method.
+    parallel = sys.modules.get('numba.np.ufunc.parallel')
+    if getattr(parallel, '_is_initialized', False) and 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+def render_figures(render, *args, parallel=False):
+    """
+    Render figures one after the other, or in parallel worker processes, and wait until all of them are saved.
+
+    Parameters:
+    - render: Module-level function that creates and saves one figure (must be picklable if parallel is True).
+    - args: Argument lists for render, one entry per figure.
+    - parallel: Render the figures in a pool of worker processes (default is False). The workers re-import the
+      calling script, so it must guard its entry point with if __name__ == '__main__'.
+    """
+
+    num_figures = len(args[0])
+    max_workers = min(num_figures, os.cpu_count() or 1)
+    if not parallel or max_workers <= 1:
+        # Starting worker processes costs more than it saves with a single worker
+        for figure_args in zip(*args):
+            render(*figure_args)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_pool_context(),
+                             initializer=use_agg_backend) as executor:
+        # Consume the results so that exceptions raised in the workers are propagated
+        list(executor.map(render, *args))
+
+def _render_action(time, action_level, title, filename, rasterized):
+    # Create a single action level plot and save it as a PDF
+    fig, ax = plt.subplots(figsize=(12, 8))
+    # Plot the action level over time
+    ax.plot(time, action_level, rasterized=rasterized)
+    ax.set_ylabel('Action Level')
+    
+    # Set plot title if a label is provided
+    if title:
+        ax.set_title(title)
+    
+    # Add grid lines and set x-axis label
+    ax.grid(True)
+    ax.set_xlim(time[0], time[-1])
+    plt.xlabel('Time (hours)')
+    
+    # Save the plot, rasterized data lines (if any) use a moderate resolution
+    plt.savefig(filename, dpi=150)
+    
+    # Close the figure to free up memory
+    plt.close(fig)
+
+def plot_actions(time, action_levels, labels=None, rasterized=False, parallel=False):
     """
     Plots action levels over time and saves each plot as a PDF.
 
@@ -9,6 +80,8 @@ def plot_actions(time, action_levels, labels=None):
     - time: Array of time points.
     - action_levels: List of action level arrays, where each array corresponds to a different action.
     - labels: List of labels for each action level plot (optional).
+    - rasterized: Rasterize the data lines (smaller and faster PDFs for very long time series, default is False).
+    - parallel: Render the plots in parallel processes (default is False, see render_figures).
 
     This function creates a plot for each action level, sets the title if labels are provided,
     and saves each plot as a PDF. If labels are provided, the plot is saved with the label name.
@@ -18,32 +91,51 @@ def plot_actions(time, action_levels, labels=None):
     # Determine the number of actions to plot
     num_actions = len(action_levels)
     
-    # Loop through each action level and create a separate plot
-    for i in range(num_actions):
-        fig, ax = plt.subplots(figsize=(12, 8))
-        # Plot the action level over time
-        ax.plot(time, action_levels[i])
-        ax.set_ylabel('Action Level')
-        
-        # Set plot title if labels are provided
-        if labels:
-            ax.set_title(labels[i])
-        
-        # Add grid lines and set x-axis label
-        ax.grid(True)
-        ax.set_xlim(time[0], time[-1])
-        plt.xlabel('Time (hours)')
-        
-        # Save plot as PDF with the label name or a default filename
-        if labels:
-            plt.savefig(f"{labels[i]}.pdf")
-        else:
-            plt.savefig(f"action_plot_{i}.pdf")
-        
-        # Close the figure to free up memory
-        plt.close(fig)
-
-def plot_updated(time, updated_data, base_data, noise_data, labels=None):
+    # Title and filename (label name or a default filename) for each plot
+    titles = [labels[i] if labels else None for i in range(num_actions)]
+    filenames = [f"{labels[i]}.pdf" if labels else f"action_plot_{i}.pdf" for i in range(num_actions)]
+    
+    # Create a separate plot for each action level
+    render_figures(_render_action, [time] * num_actions, list(action_levels), titles, filenames,
+                   [rasterized] * num_actions, parallel=parallel)
+
+def _render_updated(time, updated, base, noise, label, filename, rasterized):
+    # Create a single plot with base, updated, and noise data and save it as a PDF
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    # Plot base, updated, and noise data for the variable
+    ax.plot(time, base, label='Base Data', rasterized=rasterized)
+    ax.plot(time, updated, label='Updated Data', rasterized=rasterized)
+    ax.plot(time, noise, label='Noise Data', rasterized=rasterized)
+    ax.set_ylabel('Value')
+    
+    # Set plot title and add comfort range lines if a label is provided
+    if label:
+        ax.set_title(label)
+        # Add comfort range for specific labels
+        if label == 'Temperature':
+            ax.hlines([18, 22], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
+            ax.set_ylabel('Temperature (°C)')
+        elif label == 'Humidity':
+            ax.hlines([40, 60], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
+            ax.set_ylabel('Humidity (%)')
+        elif label == 'Moisture':
+            ax.hlines([20], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
+            ax.set_ylabel('Moisture (%)')
+    
+    # Add grid, legend, and set x-axis label
+    ax.grid(True)
+    ax.set_xlim(time[0], time[-1])
+    ax.legend()
+    plt.xlabel('Time (hours)')
+    
+    # Save the plot, rasterized data lines (if any) use a moderate resolution
+    plt.savefig(filename, dpi=150)
+    
+    # Close the figure to free up memory
+    plt.close(fig)
+
+def plot_updated(time, updated_data, base_data, noise_data, labels=None, rasterized=False, parallel=False):
     """
     Plots updated, base, and noise data over time for each variable and saves each plot as a PDF.
 
@@ -53,6 +145,8 @@ def plot_updated(time, updated_data, base_data, noise_data, labels=None):
     - base_data: List of base data arrays (one for each variable).
     - noise_data: List of noise data arrays (one for each variable).
     - labels: List of labels for each variable plot (optional).
+    - rasterized: Rasterize the data lines (smaller and faster PDFs for very long time series, default is False).
+    - parallel: Render the plots in parallel processes (default is False, see render_figures).
 
     This function creates a plot for each variable with base, updated, and noise data.
     It also adds a comfort range as horizontal lines for specific variables if labels are provided.
@@ -62,43 +156,10 @@ def plot_updated(time, updated_data, base_data, noise_data, labels=None):
     # Determine the number of data series to plot
     num_data = len(updated_data)
     
-    # Loop through each data series and create a separate plot
-    for i in range(num_data):
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Plot base, updated, and noise data for each variable
-        ax.plot(time, base_data[i], label='Base Data')
-        ax.plot(time, updated_data[i], label='Updated Data')
-        ax.plot(time, noise_data[i], label='Noise Data')
-        ax.set_ylabel('Value')
-        
-        # Set plot title and add comfort range lines if labels are provided
-        if labels:
-            ax.set_title(labels[i])
-            # Add comfort range for specific labels
-            if labels[i] == 'Temperature':
-                ax.hlines([18, 22], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
-                ax.set_ylabel('Temperature (°C)')
-            elif labels[i] == 'Humidity':
-                ax.hlines([40, 60], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
-                ax.set_ylabel('Humidity (%)')
-            elif labels[i] == 'Moisture':
-                ax.hlines([20], time[0], time[-1], colors='r', linestyles='dashed', label='Comfort Range')
-                ax.set_ylabel('Moisture (%)')
-        
-        # Add grid, legend, and set x-axis label
-        ax.grid(True)
-        ax.set_xlim(time[0], time[-1])
-        ax.legend()
-        plt.xlabel('Time (hours)')
-        
-        # Save plot as PDF with the label name or a default filename
-        if labels:
-            plt.savefig(f"{labels[i]}.pdf")
-        else:
-            plt.savefig(f"plot_{i}.pdf")
-        
-        # Close the figure to free up memory
-        plt.close(fig)
-
-
+    # Title and filename (label name or a default filename) for each plot
+    titles = [labels[i] if labels else None for i in range(num_data)]
+    filenames = [f"{labels[i]}.pdf" if labels else f"plot_{i}.pdf" for i in range(num_data)]
+    
+    # Create a separate plot for each data series
+    render_figures(_render_updated, [time] * num_data, list(updated_data), list(base_data), list(noise_data),
+                   titles, filenames, [rasterized] * num_data, parallel=parallel)
@@ -1,4 +1,7 @@
 import numpy as np
+from numba import njit
+
+from Decision_Making import humidity_kernels, heating_kernel
 
 def smooth_data(current_timestamp, data, window_size=5):
     """
@@ -23,14 +26,14 @@ def smooth_data(current_timestamp, data, window_size=5):
     
     return smoothed_value
 
-def update_temperature(time_stamp, temp_base, modified_temp, action_level_heater, min_limit, max_limit, decay_rate, action_factor):
+@njit(cache=True)
+def update_temperature(current_temp_base, previous_modified_temp, action_level_heater, min_limit, max_limit, decay_rate, action_factor):
     """
     Update the modified temperature based on heater action, base temperature, and decay rate.
 
     Parameters:
-    - time_stamp: The current time index.
-    - temp_base: List of base temperature values.
-    - modified_temp: List of modified temperature values.
+    - current_temp_base: Base temperature value at the current time index.
+    - previous_modified_temp: Modified temperature value at the previous time index.
     - action_level_heater: Intensity of heater action.
     - min_limit: Minimum temperature limit.
     - max_limit: Maximum temperature limit.
@@ -41,11 +44,6 @@ def update_temperature(time_stamp, temp_base, modified_temp, action_level_heater
     - new_modified_temp: The updated modified temperature at the current time index.
     """
 
-    # Get the base temperature at the current timestamp
-    current_temp_base = temp_base[time_stamp]
-    # Get the modified temperature from the previous timestamp
-    previous_modified_temp = modified_temp[time_stamp-1]
-    
     # Scale heater action level to a range of 0 to 1
     intensity = action_level_heater / 10
     
@@ -56,22 +54,20 @@ def update_temperature(time_stamp, temp_base, modified_temp, action_level_heater
     elif intensity < 0:
         new_modified_temp = previous_modified_temp - (previous_modified_temp - min_limit) * abs(intensity) * action_factor
     else:
-        # If no action, decay towards the base temperature
-        if previous_modified_temp > current_temp_base:
-            new_modified_temp = max(current_temp_base, previous_modified_temp - decay_rate)
-        else:
-            new_modified_temp = min(current_temp_base, previous_modified_temp + decay_rate)
+        # If no action, decay towards the base temperature by at most decay_rate
+        # (the base temperature clipped to within decay_rate of the previous temperature)
+        new_modified_temp = min(max(current_temp_base, previous_modified_temp - decay_rate), previous_modified_temp + decay_rate)
 
     return new_modified_temp
 
-def update_humidity(time_stamp, humidity_base, modified_humidity, action_level_dehumidifier, action_level_ventilation, min_limit, decay_rate, action_factor):
+@njit(cache=True)
+def update_humidity(current_humidity_base, previous_modified_humidity, action_level_dehumidifier, action_level_ventilation, min_limit, decay_rate, action_factor):
     """
     Update the modified humidity based on dehumidifier and ventilation actions, base humidity, and decay rate.
 
     Parameters:
-    - time_stamp: The current time index.
-    - humidity_base: List of base humidity values.
-    - modified_humidity: List of modified humidity values.
+    - current_humidity_base: Base humidity value at the current time index.
+    - previous_modified_humidity: Modified humidity value at the previous time index.
     - action_level_dehumidifier: Intensity of dehumidifier action.
     - action_level_ventilation: Intensity of ventilation action.
     - min_limit: Minimum humidity limit.
@@ -82,11 +78,6 @@ def update_humidity(time_stamp, humidity_base, modified_humidity, action_level_d
     - new_modified_humidity: The updated modified humidity at the current time index.
     """
 
-    # Get the base humidity at the current timestamp
-    current_humidity_base = humidity_base[time_stamp]
-    # Get the modified humidity from the previous timestamp
-    previous_modified_humidity = modified_humidity[time_stamp-1]
-
     # Combine dehumidifier and ventilation actions into a single intensity measure, scaled to 0-1
     intensity = (action_level_dehumidifier + action_level_ventilation) / 10
 
@@ -99,14 +90,14 @@ def update_humidity(time_stamp, humidity_base, modified_humidity, action_level_d
     
     return new_modified_humidity
 
-def update_moisture(time_stamp, moisture_base, modified_moisture, action_level_ventilation, min_limit, decay_rate, action_factor):
+@njit(cache=True)
+def update_moisture(current_moisture_base, previous_modified_moisture, action_level_ventilation, min_limit, decay_rate, action_factor):
     """
     Update the modified moisture based on ventilation action, base moisture, and decay rate.
 
     Parameters:
-    - time_stamp: The current time index.
-    - moisture_base: List of base moisture values.
-    - modified_moisture: List of modified moisture values.
+    - current_moisture_base: Base moisture value at the current time index.
+    - previous_modified_moisture: Modified moisture value at the previous time index.
     - action_level_ventilation: Intensity of ventilation action.
     - min_limit: Minimum moisture limit.
     - decay_rate: Rate at which modified moisture approaches the base moisture when no action is applied.
@@ -116,11 +107,6 @@ def update_moisture(time_stamp, moisture_base, modified_moisture, action_level_v
     - new_modified_moisture: The updated modified moisture at the current time index.
     """
 
-    # Get the base moisture at the current timestamp
-    current_moisture_base = moisture_base[time_stamp]
-    # Get the modified moisture from the previous timestamp
-    previous_modified_moisture = modified_moisture[time_stamp-1]
-
     # Scale ventilation action level to a range of 0 to 1
     intensity = action_level_ventilation / 10
     
@@ -131,4 +117,96 @@ def update_moisture(time_stamp, moisture_base, modified_moisture, action_level_v
         # Decay moisture towards base moisture when no action is applied
         new_modified_moisture = previous_modified_moisture + (current_moisture_base - previous_modified_moisture) * decay_rate
     
-    return new_modified_moisture
\ No newline at end of file
+    return new_modified_moisture
+
+@njit(cache=True)
+def simulate_loop(temp_base, humidity_base, moisture_base, temp_noise, humidity_noise, moisture_noise,
+                  temp_min_limit, temp_max_limit, temp_decay_rate, temp_action_factor,
+                  humidity_min_limit, humidity_decay_rate, humidity_action_factor,
+                  moisture_min_limit, moisture_decay_rate, moisture_action_factor, window_size=5, control_period=1):
+    """
+    Run the closed-loop simulation: update the data with the previous actions, smooth the noisy sensor
+    readings and determine the new actions with the fuzzy controllers at each time point.
+
+    Parameters:
+    - temp_base, humidity_base, moisture_base: Base data arrays (their floating point type is used for the results).
+    - temp_noise, humidity_noise, moisture_noise: Noise arrays added to the updated data to simulate sensor readings.
+    - temp_min_limit, temp_max_limit, temp_decay_rate, temp_action_factor: Parameters of update_temperature.
+    - humidity_min_limit, humidity_decay_rate, humidity_action_factor: Parameters of update_humidity.
+    - moisture_min_limit, moisture_decay_rate, moisture_action_factor: Parameters of update_moisture.
+    - window_size: The number of data points to include in the moving average (default is 5).
+    - control_period: Number of time points between controller evaluations, the previous actions are kept in between (default is 1).
+
+    Returns:
+    - modified_temp, modified_humidity, modified_moisture: The updated data arrays.
+    - dehumidifier_action, ventilation_action, heating_action: The action level arrays.
+    """
+
+    n = temp_base.shape[0]
+
+    # Allocate updated data arrays in the type of the base data, every point after the first is written by the loop
+    modified_temp = np.empty(n, temp_base.dtype)
+    modified_humidity = np.empty(n, humidity_base.dtype)
+    modified_moisture = np.empty(n, moisture_base.dtype)
+    modified_temp[0] = temp_base[0]
+    modified_humidity[0] = humidity_base[0]
+    modified_moisture[0] = moisture_base[0]
+
+    # Allocate action level arrays for dehumidifier, ventilation, and heating, written at every point
+    dehumidifier_action = np.empty(n, temp_base.dtype)
+    ventilation_action = np.empty(n, temp_base.dtype)
+    heating_action = np.empty(n, temp_base.dtype)
+
+    # Ring buffers holding the noisy readings within the moving average window
+    temp_window = np.empty(window_size, temp_base.dtype)
+    humidity_window = np.empty(window_size, humidity_base.dtype)
+    moisture_window = np.empty(window_size, moisture_base.dtype)
+
+    for i in range(n):
+        if i > 0:
+            # Update temperature, humidity, and moisture with actions and decay
+            modified_temp[i] = update_temperature(
+                temp_base[i], modified_temp[i - 1], heating_action[i - 1],
+                temp_min_limit, temp_max_limit, temp_decay_rate, temp_action_factor)
+            modified_humidity[i] = update_humidity(
+                humidity_base[i], modified_humidity[i - 1], dehumidifier_action[i - 1], ventilation_action[i - 1],
+                humidity_min_limit, humidity_decay_rate, humidity_action_factor)
+            modified_moisture[i] = update_moisture(
+                moisture_base[i], modified_moisture[i - 1], ventilation_action[i - 1],
+                moisture_min_limit, moisture_decay_rate, moisture_action_factor)
+
+        # Add noise to the updated data at the current time point only
+        slot = i % window_size
+        temp_window[slot] = modified_temp[i] + temp_noise[i]
+        humidity_window[slot] = modified_humidity[i] + humidity_noise[i]
+        moisture_window[slot] = modified_moisture[i] + moisture_noise[i]
+
+        # Sum the window from the oldest reading, in the same order as smooth_data
+        # (the heating action can be a rounding-level value whose sign selects the update branch,
+        # so a running sum would change the results)
+        count = min(i + 1, window_size)
+        temp_sum = 0.0
+        humidity_sum = 0.0
+        moisture_sum = 0.0
+        for j in range(i + 1 - count, i + 1):
+            slot = j % window_size
+            temp_sum += temp_window[slot]
+            humidity_sum += humidity_window[slot]
+            moisture_sum += moisture_window[slot]
+
+        # Smoothed sensor readings for the controllers
+        temperature = temp_sum / count
+        humidity = humidity_sum / count
+        moisture = moisture_sum / count
+
+        if i % control_period == 0:
+            # Determine actions for dehumidifier, ventilation, and heating based on sensor data (allows to run actions at larger intervals)
+            dehumidifier_action[i], ventilation_action[i] = humidity_kernels(humidity, moisture)
+            heating_action[i] = heating_kernel(temperature)
+        else:
+            # Maintain the previous action level
+            dehumidifier_action[i] = dehumidifier_action[i - 1]
+            ventilation_action[i] = ventilation_action[i - 1]
+            heating_action[i] = heating_action[i - 1]
+
+    return modified_temp, modified_humidity, modified_moisture, dehumidifier_action, ventilation_action, heating_action
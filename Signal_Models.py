@@ -1,6 +1,354 @@
+import weakref
+from functools import lru_cache
+
 import numpy as np
 
-def simulate_temperature(time, base_temp, amplitude, noise_level):
+try:
+    # Cython build of the kernels, built by running build_kernels.py
+    import _signal_kernels
+except ImportError:
+    _signal_kernels = None
+
+try:
+    # Ahead-of-time compiled kernels, built by running Signal_Models_aot.py
+    import signal_kernels
+except ImportError:
+    signal_kernels = None
+
+# Precompiled kernel modules in order of preference
+_PRECOMPILED = [module for module in (_signal_kernels, signal_kernels) if module is not None]
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Without Numba the kernels run as plain Python functions
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+def _kernel(name, dtype, fallback):
+    # Precompiled kernel for the given floating point type if one is available, otherwise the JIT (or Python) fallback
+    for module in _PRECOMPILED:
+        kernel = getattr(module, name + '_' + np.dtype(dtype).name, None)
+        if kernel is not None:
+            return kernel
+    return fallback
+
+# Angular frequency of the daily cycle (rad/hour)
+_OMEGA = 2.0 * np.pi / 24.0
+
+# Random generator (PCG64) used when no generator is passed to the simulators
+_RNG = np.random.default_rng()
+
+# Arguments (duration, resolution, dtype) of the live time vectors from generate_time_vector, by id. An entry is removed
+# when its array is garbage collected, so an id is never matched to a different array.
+_TIME_KEYS = {}
+
+# Number of time points processed per tile by the fused simulation kernel, chosen so the tile's working set stays in L2
+_TILE_SIZE = 32768
+
+@njit(cache=True)
+def _uniform_step(time, tolerance):
+    """
+    Find the spacing of a uniformly sampled time vector.
+
+    Parameters:
+    - time: Array of time points (in hours).
+    - tolerance: Largest allowed deviation of a time point from the uniform grid.
+
+    Returns:
+    - step: Spacing between consecutive time points, or zero if the time points are not uniformly spaced.
+    """
+
+    n = time.shape[0]
+    start = float(time[0])
+    step = (float(time[n-1]) - start) / (n - 1)
+    for i in range(n):
+        if not abs(time[i] - (start + i * step)) <= tolerance:
+            return 0.0
+
+    return step
+
+if not NUMBA_AVAILABLE:
+    def _uniform_step(time, tolerance):
+        # Without Numba, check all time points at once instead of looping over them in Python
+        n = time.shape[0]
+        start = float(time[0])
+        step = (float(time[n-1]) - start) / (n - 1)
+        if not np.abs(time - (start + step * np.arange(n))).max() <= tolerance:
+            return 0.0
+
+        return step
+
+@lru_cache(maxsize=32)
+def _day_sinusoid(start, step, period):
+    # Daily sinusoid over the first day of a uniform time vector, shared between calls so protect it against modification
+    day = np.sin(_OMEGA * (start + step * np.arange(period)))
+    day.setflags(write=False)
+    return day
+
+def _daily_period(time):
+    """
+    Number of time points per day if the time vector is uniformly sampled with a whole number of points per day.
+
+    Parameters:
+    - time: Array of time points (in hours).
+
+    Returns:
+    - period: Number of time points per day and spacing of the time points, or (0, 0.0) if the daily sinusoid cannot
+      be tabulated.
+    """
+
+    if time.ndim != 1 or time.shape[0] < 2 or not np.issubdtype(time.dtype, np.floating):
+        return 0, 0.0
+
+    # Allow for the rounding of the time points in their own precision
+    tolerance = 4.0 * np.finfo(time.dtype).eps * max(abs(float(time[0])), abs(float(time[-1])), 24.0)
+    step = _kernel('uniform_step', time.dtype, _uniform_step)(time, tolerance)
+    if step <= 0.0:
+        return 0, 0.0
+    period = int(round(24.0 / step))
+    # Only worth it if the time vector is longer than one day
+    if period >= time.shape[0] or abs(period * step - 24.0) > tolerance:
+        return 0, 0.0
+
+    return period, step
+
+@lru_cache(maxsize=16)
+def _base_sinusoid(time_key, base, amplitude, dtype):
+    # Daily cycle of the time vector generated with the given arguments, shared between calls so protect it against
+    # modification
+    signal = _evaluate_daily_cycle(_time_vector(*time_key), base, amplitude, dtype)
+    signal.setflags(write=False)
+    return signal
+
+def _daily_cycle(time, base, amplitude, dtype, out=None):
+    """
+    Evaluate base + amplitude * sin(_OMEGA * time). The result is memoized for the time vectors returned by
+    generate_time_vector (by their arguments), so repeated simulations on the same time vector reuse it.
+
+    Parameters:
+    - time: Array of time points (in hours).
+    - base: The value around which the daily fluctuation occurs.
+    - amplitude: The amplitude of the daily fluctuation.
+    - dtype: Floating point type of the signal.
+    - out: Optional output array for the signal.
+
+    Returns:
+    - signal: The base value with the daily sinusoidal fluctuation (read-only if memoized and no output is given).
+    """
+
+    time = np.asarray(time)
+    time_key = _TIME_KEYS.get(id(time))
+    # Other arrays (including views of a generated time vector) may change, and so may a generated time vector that
+    # was made writable again
+    if time_key is None or time.flags.writeable:
+        return _evaluate_daily_cycle(time, base, amplitude, dtype, out)
+
+    signal = _base_sinusoid(time_key, float(base), float(amplitude), np.dtype(dtype))
+    if out is None:
+        return signal
+    np.copyto(out, signal)
+    return out
+
+def _evaluate_daily_cycle(time, base, amplitude, dtype, out=None):
+    """
+    Evaluate base + amplitude * sin(_OMEGA * time) in a single output buffer.
+
+    Parameters:
+    - time: Array of time points (in hours).
+    - base: The value around which the daily fluctuation occurs.
+    - amplitude: The amplitude of the daily fluctuation.
+    - dtype: Floating point type of the signal.
+    - out: Optional output array for the signal.
+
+    Returns:
+    - signal: The base value with the daily sinusoidal fluctuation.
+    """
+
+    signal = np.empty(time.shape, dtype=dtype) if out is None else out
+    # NumPy's float32 sin is vectorized and as fast as checking the time vector, so only tabulate wider types
+    period, step = _daily_period(time) if signal.dtype.itemsize > 4 else (0, 0.0)
+    if period:
+        # The sinusoid repeats every day, so evaluate the first day only and copy it over the following days
+        signal[:period] = _day_sinusoid(float(time[0]), step, period) * amplitude + base
+        filled = period
+        while filled < signal.shape[0]:
+            count = min(filled, signal.shape[0] - filled)
+            signal[filled:filled + count] = signal[:count]
+            filled += count
+        return signal
+
+    # Work in place so no intermediate arrays are allocated
+    np.multiply(time, signal.dtype.type(_OMEGA), out=signal)
+    np.sin(signal, out=signal)
+    signal *= amplitude
+    signal += base
+
+    return signal
+
+def _gaussian_noise(noise, noise_level, rng):
+    """
+    Draw zero-mean Gaussian noise directly into a buffer.
+
+    Parameters:
+    - noise: Output array for the noise values.
+    - noise_level: The standard deviation of the noise.
+    - rng: Random generator for the noise.
+
+    Returns:
+    - noise: Noise values with the given standard deviation.
+    """
+
+    rng.standard_normal(out=noise, dtype=noise.dtype)
+    noise *= noise_level
+
+    return noise
+
+@njit(cache=True)
+def _accumulate_rain(base, rain, rain_impact, drying_speed, cumulative):
+    """
+    Apply the cumulative effect of rain to a base signal.
+
+    Parameters:
+    - base: Base values of the signal.
+    - rain: Boolean array indicating rain occurrence.
+    - rain_impact: Incremental increase during rain events.
+    - drying_speed: Rate of reduction towards the base values when it's not raining.
+    - cumulative: Output array for the signal with the cumulative rain effect.
+    """
+
+    n = base.shape[0]
+    if n == 0:
+        return
+    # Carry the cumulative value in double precision and only round it when storing, so a float32 signal does not drift
+    carry = np.float64(base[0])
+    cumulative[0] = carry
+    for i in range(1, n):
+        if rain[i]:
+            # Increase during rain
+            carry += rain_impact
+        else:
+            # Gradually reduce when it's not raining, but not below the base value
+            carry = np.fmax(np.float64(base[i]), carry - drying_speed)
+        cumulative[i] = carry
+
+def _accumulate_rain_scan(base, rain, rain_impact, drying_speed, cumulative):
+    """
+    Apply the cumulative effect of rain to a base signal with whole-array NumPy operations.
+
+    Every step is cumulative[i] = max(floor[i], cumulative[i-1] + step[i]), with step rain_impact and no floor while
+    raining, and step -drying_speed with floor base[i] otherwise. Subtracting the running sum of the steps turns this
+    into a running maximum, so the recurrence is solved by a cumulative sum and a maximum accumulation.
+
+    The scan works in double precision and rounds once, so float32 results are within one ulp of _accumulate_rain.
+    float64 results differ by the rounding of the running sum, bounded by n * eps * max(|cumulative|) (measured:
+    2e-12 at 721 points, 6e-11 at 43k points, 3e-9 at 1M points).
+
+    Parameters:
+    - base: Base values of the signal.
+    - rain: Boolean array indicating rain occurrence.
+    - rain_impact: Incremental increase during rain events.
+    - drying_speed: Rate of reduction towards the base values when it's not raining.
+    - cumulative: Output array for the signal with the cumulative rain effect.
+    """
+
+    if base.shape[0] == 0:
+        return
+
+    # Running sum of the steps, computed in double precision since it grows with the length of the signal
+    steps = np.where(rain, float(rain_impact), -float(drying_speed))
+    steps[0] = 0.0
+    offset = np.cumsum(steps)
+
+    # Floors relative to the running sum, the first value is the base value itself
+    floors = np.subtract(base, offset)
+    floors[rain] = -np.inf
+    floors[0] = base[0]
+    np.maximum.accumulate(floors, out=floors)
+    np.add(floors, offset, out=cumulative, casting='unsafe')
+
+def _accumulate(base, rain, rain_impact, drying_speed, cumulative):
+    # Prefer a precompiled kernel for the signal dtype, then the JIT kernel, then the NumPy scan
+    kernel = _kernel('accumulate_rain', cumulative.dtype, _accumulate_rain if NUMBA_AVAILABLE else _accumulate_rain_scan)
+    kernel(base, rain, float(rain_impact), float(drying_speed), cumulative)
+
+@njit(cache=True)
+def _simulate_tiled(base, rain, rain_impact, drying_speed, noise_level, spike_chance, spike_value, rng, noise, noisy):
+    """
+    Apply the cumulative rain effect, spikes and noise to a signal in a single pass, one tile at a time.
+
+    Parameters:
+    - base: Base values of the signal.
+    - rain: Boolean array indicating rain occurrence.
+    - rain_impact: Incremental increase during rain events.
+    - drying_speed: Rate of reduction towards the base values when it's not raining.
+    - noise_level: The standard deviation of the noise.
+    - spike_chance: Probability of random spikes (no uniform numbers are drawn when zero).
+    - spike_value: Value of the increase during random spikes.
+    - rng: Random generator for the noise and spikes.
+    - noise: Output array for the noise values including spikes.
+    - noisy: Output array for the signal with cumulative rain effect and noise.
+    """
+
+    n = base.shape[0]
+    if n == 0:
+        return
+    # The cumulative value is carried from one tile to the next in double precision, it is only rounded to the signal
+    # dtype when storing
+    cumulative = np.float64(base[0])
+    for start in range(0, n, _TILE_SIZE):
+        stop = min(start + _TILE_SIZE, n)
+        # Draw the random numbers of this tile only
+        normals = rng.standard_normal(stop - start)
+        uniforms = rng.random(stop - start if spike_chance > 0 else 0)
+
+        for i in range(start, stop):
+            if i > 0:
+                if rain[i]:
+                    # Increase during rain
+                    cumulative += rain_impact
+                else:
+                    # Gradually reduce when it's not raining, but not below the base value
+                    cumulative = np.fmax(np.float64(base[i]), cumulative - drying_speed)
+
+            # Generate noise and random spikes, then add them to the cumulative value
+            value = noise_level * normals[i - start]
+            if spike_chance > 0 and uniforms[i - start] < spike_chance:
+                value += spike_value
+            noise[i] = value
+            noisy[i] = cumulative + noise[i]
+
+def _simulate_signal(base, rain, rain_impact, drying_speed, noise_level, rng, noise, noisy, spike_chance=0.0,
+                     spike_value=0.0):
+    # Fill the noise and noisy output arrays of a signal with the given base
+    rain = np.asarray(rain) != 0
+    if _PRECOMPILED or not NUMBA_AVAILABLE:
+        # Without the JIT, accumulate with the precompiled kernel or the NumPy scan, in double precision like the fused
+        # kernel
+        cumulative = np.empty(base.shape)
+        _accumulate(np.asarray(base, dtype=np.float64), rain, rain_impact, drying_speed, cumulative)
+        # Draw the noise and spikes in double precision and in the order of the fused kernel (normals, then uniforms,
+        # one tile at a time), so a seeded generator gives the same signals whichever kernel is used
+        for start in range(0, base.shape[0], _TILE_SIZE):
+            stop = min(start + _TILE_SIZE, base.shape[0])
+            values = rng.standard_normal(stop - start)
+            values *= noise_level
+            if spike_chance > 0:
+                values[rng.random(stop - start) < spike_chance] += spike_value
+            noise[start:stop] = values
+        np.add(cumulative, noise, out=noisy)
+        return
+
+    _simulate_tiled(base, rain, float(rain_impact), float(drying_speed), float(noise_level), float(spike_chance),
+                    float(spike_value), rng, noise, noisy)
+
+def simulate_temperature(time, base_temp, amplitude, noise_level, dtype=np.float32, rng=None):
     """
     Simulates temperature over time with a daily fluctuation and noise.
 
@@ -9,6 +357,8 @@ def simulate_temperature(time, base_temp, amplitude, noise_level):
     - base_temp: The base temperature around which daily fluctuations occur.
     - amplitude: The amplitude of temperature fluctuations.
     - noise_level: The standard deviation of noise added to simulate variability.
+    - dtype: Floating point type of the simulated signals.
+    - rng: Random generator (np.random.Generator) for the noise, a module-level generator is used if None.
 
     Returns:
     - temperature_base: The base temperature with daily fluctuation (sinusoidal).
@@ -16,16 +366,20 @@ def simulate_temperature(time, base_temp, amplitude, noise_level):
     - temperature_noisy: The simulated temperature with added noise.
     """
 
+    # The three signals are rows of a single contiguous buffer
+    temperature_base, noise, temperature_noisy = np.empty((3,) + np.shape(time), dtype=dtype)
+
     # Generate the base temperature with daily sinusoidal fluctuation
-    temperature_base = base_temp + amplitude * np.sin(2 * np.pi * (time / 24))
+    _daily_cycle(time, base_temp, amplitude, dtype, out=temperature_base)
     # Generate random noise for each time point
-    noise = np.random.normal(0, noise_level, size=temperature_base.shape)
+    _gaussian_noise(noise, noise_level, _RNG if rng is None else rng)
     # Add noise to the base temperature to get the final noisy temperature
-    temperature_noisy = temperature_base + noise
+    np.add(temperature_base, noise, out=temperature_noisy)
     
     return temperature_base, noise, temperature_noisy
 
-def simulate_humidity(time, rain, base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance, spike_value):
+def simulate_humidity(time, rain, base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance, spike_value,
+                      dtype=np.float32, rng=None):
     """
     Simulates humidity over time with a cumulative effect during rain, spikes, and noise.
 
@@ -39,6 +393,8 @@ def simulate_humidity(time, rain, base_humidity, amplitude, rain_impact, drying_
     - noise_level: The standard deviation of noise added to simulate variability.
     - spike_chance: Probability of random humidity spikes.
     - spike_value: Value of humidity increase during random spikes.
+    - dtype: Floating point type of the simulated signals.
+    - rng: Random generator (np.random.Generator) for the noise, a module-level generator is used if None.
 
     Returns:
     - humidity_base: The base humidity with daily fluctuation (sinusoidal).
@@ -46,30 +402,18 @@ def simulate_humidity(time, rain, base_humidity, amplitude, rain_impact, drying_
     - humidity_noisy: The simulated humidity with cumulative rain effect and noise.
     """
 
+    # The three signals are rows of a single contiguous buffer
+    humidity_base, noise, humidity_noisy = np.empty((3,) + np.shape(time), dtype=dtype)
+
     # Generate the base humidity with daily sinusoidal fluctuation
-    humidity_base = base_humidity + amplitude * np.sin(2 * np.pi * (time / 24))
-    # Initialize cumulative humidity based on base humidity
-    cumulative_humidity = np.copy(humidity_base)
-    
-    # Apply cumulative effects due to rain
-    for i in range(1, len(time)):
-        if rain[i]:
-            # Increase humidity during rain
-            cumulative_humidity[i] = cumulative_humidity[i-1] + rain_impact
-        else:
-            # Gradually reduce humidity when it's not raining
-            cumulative_humidity[i] = max(humidity_base[i], cumulative_humidity[i-1] - drying_speed)
-
-    # Generate random spikes in humidity
-    spikes = np.random.choice([0, spike_value], size=humidity_base.shape, p=[1 - spike_chance, spike_chance])
-    # Generate noise and add it to the spikes
-    noise = spikes + np.random.normal(0, noise_level, size=humidity_base.shape)
-    # Add noise to the cumulative humidity to get the final noisy humidity
-    humidity_noisy = cumulative_humidity + noise
+    _daily_cycle(time, base_humidity, amplitude, dtype, out=humidity_base)
+    # Apply cumulative effects due to rain, random spikes and noise in one pass
+    _simulate_signal(humidity_base, rain, rain_impact, drying_speed, noise_level, _RNG if rng is None else rng, noise,
+                     humidity_noisy, spike_chance, spike_value)
     
     return humidity_base, noise, humidity_noisy
 
-def simulate_moisture(time, rain, base_moisture, rain_impact, drying_speed, noise_level):
+def simulate_moisture(time, rain, base_moisture, rain_impact, drying_speed, noise_level, dtype=np.float32, rng=None):
     """
     Simulates moisture accumulation over time, especially during rain events.
 
@@ -80,78 +424,258 @@ def simulate_moisture(time, rain, base_moisture, rain_impact, drying_speed, nois
     - rain_impact: Incremental moisture increase during rain events.
     - drying_speed: Rate of moisture reduction when rain stops.
     - noise_level: The standard deviation of noise added to simulate variability.
+    - dtype: Floating point type of the simulated signals.
+    - rng: Random generator (np.random.Generator) for the noise, a module-level generator is used if None.
 
     Returns:
-    - moisture_base: The baseline moisture level.
+    - moisture_base: The baseline moisture level (read-only view).
     - noise: Noise values added to simulate randomness.
     - moisture_noisy: The simulated moisture with cumulative rain effect and noise.
     """
 
-    # Initialize the base moisture level for each time point
-    moisture_base = np.full_like(time, base_moisture, dtype=float)
-    # Initialize cumulative moisture based on base moisture
-    cumulative_moisture = np.copy(moisture_base)
-    
-    # Apply cumulative effects due to rain
-    for i in range(1, len(time)):
-        if rain[i]:
-            # Accumulate moisture during rain
-            cumulative_moisture[i] = cumulative_moisture[i-1] + rain_impact
-        else:
-            # Gradually reduce moisture when it's not raining
-            cumulative_moisture[i] = max(moisture_base[i], cumulative_moisture[i-1] - drying_speed)
+    # The base moisture level is constant, so expose it as a read-only zero-stride view instead of filling an array
+    moisture_base = np.broadcast_to(np.asarray(base_moisture, dtype=dtype), np.shape(time))
+    # The noise and noisy signals are rows of a single contiguous buffer
+    noise, moisture_noisy = np.empty((2,) + np.shape(time), dtype=dtype)
 
-    # Generate noise for each time point
-    noise = np.random.normal(0, noise_level, size=moisture_base.shape)
-    # Add noise to the cumulative moisture to get the final noisy moisture
-    moisture_noisy = cumulative_moisture + noise
+    # Apply cumulative effects due to rain and noise in one pass
+    _simulate_signal(moisture_base, rain, rain_impact, drying_speed, noise_level, _RNG if rng is None else rng, noise,
+                     moisture_noisy)
     
     return moisture_base, noise, moisture_noisy
 
-def generate_time_vector(duration, resolution):
+@njit(parallel=True, cache=True)
+def _simulate_batch(base, rain, rain_impact, drying_speed, noise_level, spike_chance, spike_value, seeds, noise, noisy):
+    """
+    Apply the cumulative rain effect, spikes and noise to a batch of independent runs, one run per thread.
+
+    Parameters:
+    - base: Base values of the signal for each run, shape (num_runs, n).
+    - rain: Boolean array indicating rain occurrence for each run, shape (num_runs, n).
+    - rain_impact: Incremental increase during rain events for each run.
+    - drying_speed: Rate of reduction towards the base values when it's not raining for each run.
+    - noise_level: The standard deviation of the noise for each run.
+    - spike_chance: Probability of random spikes for each run.
+    - spike_value: Value of the increase during random spikes for each run.
+    - seeds: Seed of the random numbers for each run.
+    - noise: Output array for the noise values including spikes, shape (num_runs, n).
+    - noisy: Output array for the signal with cumulative rain effect and noise, shape (num_runs, n).
+    """
+
+    num_runs, n = base.shape
+    if n == 0:
+        return
+    for k in prange(num_runs):
+        # Every thread has its own random state, seeding it per run makes each run reproducible regardless of the
+        # thread it is scheduled on
+        np.random.seed(seeds[k])
+
+        # Parameters of this run
+        impact = rain_impact[k]
+        drying = drying_speed[k]
+        level = noise_level[k]
+        chance = spike_chance[k]
+        spike = spike_value[k]
+
+        # The cumulative value is carried in double precision and only rounded to the signal dtype when storing
+        cumulative = np.float64(base[k, 0])
+        for start in range(0, n, _TILE_SIZE):
+            stop = min(start + _TILE_SIZE, n)
+            # Draw the random numbers of this tile only, in the order of the Python fallback in _run_batch
+            normals = np.random.standard_normal(stop - start)
+            uniforms = np.random.random(stop - start if chance > 0 else 0)
+
+            for i in range(start, stop):
+                if i > 0:
+                    if rain[k, i]:
+                        # Increase during rain
+                        cumulative += impact
+                    else:
+                        # Gradually reduce when it's not raining, but not below the base value
+                        cumulative = np.fmax(np.float64(base[k, i]), cumulative - drying)
+
+                # Generate noise and random spikes in the same pass
+                value = level * normals[i - start]
+                if chance > 0 and uniforms[i - start] < chance:
+                    value += spike
+                noise[k, i] = value
+                noisy[k, i] = cumulative + noise[k, i]
+
+def _batch_parameters(rain, *parameters):
+    # Broadcast scalar or per-run parameters to contiguous double precision arrays with one value per run, where the
+    # number of runs also follows from the leading dimension of a per-run rain array
+    num_runs = np.broadcast_shapes(np.shape(rain)[:-1], *map(np.shape, parameters)) or (1,)
+    return [np.ascontiguousarray(np.broadcast_to(parameter, num_runs), dtype=np.float64) for parameter in parameters]
+
+def _run_seeds(rng, num_runs):
+    # Seeds of the runs, consecutive from one random starting point so no two runs of a batch share a random stream
+    first = rng.integers(2**32, dtype=np.uint64)
+    return ((first + np.arange(num_runs, dtype=np.uint64)) % 2**32).astype(np.uint32)
+
+def _run_batch(rain, signal_base, rain_impact, drying_speed, noise_level, spike_chance, spike_value, rng, noise, noisy):
+    # Share a single rain vector between all runs unless one is given per run
+    rain = np.broadcast_to(np.asarray(rain) != 0, signal_base.shape)
+    seeds = _run_seeds(_RNG if rng is None else rng, signal_base.shape[0])
+    if not NUMBA_AVAILABLE:
+        # Without the JIT, simulate one run at a time. Each run draws from a legacy generator with its seed, which
+        # produces the same stream as the seeded per-thread generator of _simulate_batch.
+        for k, seed in enumerate(seeds):
+            _simulate_signal(signal_base[k], rain[k], rain_impact[k], drying_speed[k], noise_level[k],
+                             np.random.RandomState(seed), noise[k], noisy[k], spike_chance[k], spike_value[k])
+        return
+
+    _simulate_batch(signal_base, rain, rain_impact, drying_speed, noise_level, spike_chance, spike_value, seeds, noise,
+                    noisy)
+
+def simulate_humidity_batch(time, rain, base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance,
+                            spike_value, dtype=np.float32, rng=None):
+    """
+    Simulates humidity for a batch of independent runs in parallel, e.g. for Monte-Carlo or sensitivity studies.
+
+    Parameters:
+    - time: Array of time points (in hours).
+    - rain: Array indicating rain occurrence, either shared by all runs (n) or one row per run (num_runs, n).
+    - base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance, spike_value: Parameters as in
+      simulate_humidity, each either a scalar or an array with one value per run.
+    - dtype: Floating point type of the simulated signals.
+    - rng: Random generator (np.random.Generator) the random streams of the runs are derived from, a module-level
+      generator is used if None.
+
+    Returns:
+    - humidity_base: The base humidity with daily fluctuation for each run, shape (num_runs, n).
+    - noise: Noise values including spikes and random noise for each run.
+    - humidity_noisy: The simulated humidity with cumulative rain effect and noise for each run.
+    """
+
+    (base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance, spike_value) = _batch_parameters(
+        rain, base_humidity, amplitude, rain_impact, drying_speed, noise_level, spike_chance, spike_value)
+
+    # The three signals are slices of a single contiguous buffer
+    humidity_base, noise, humidity_noisy = np.empty((3, base_humidity.shape[0], np.shape(time)[0]), dtype=dtype)
+
+    # Generate the base humidity of every run from a single daily sinusoid
+    np.multiply(_daily_cycle(time, 0.0, 1.0, dtype), amplitude[:, np.newaxis], out=humidity_base)
+    humidity_base += base_humidity[:, np.newaxis]
+    _run_batch(rain, humidity_base, rain_impact, drying_speed, noise_level, spike_chance, spike_value, rng, noise,
+               humidity_noisy)
+
+    return humidity_base, noise, humidity_noisy
+
+def simulate_moisture_batch(time, rain, base_moisture, rain_impact, drying_speed, noise_level, dtype=np.float32,
+                            rng=None):
+    """
+    Simulates moisture for a batch of independent runs in parallel, e.g. for Monte-Carlo or sensitivity studies.
+
+    Parameters:
+    - time: Array of time points (in hours).
+    - rain: Array indicating rain occurrence, either shared by all runs (n) or one row per run (num_runs, n).
+    - base_moisture, rain_impact, drying_speed, noise_level: Parameters as in simulate_moisture, each either a scalar or
+      an array with one value per run.
+    - dtype: Floating point type of the simulated signals.
+    - rng: Random generator (np.random.Generator) the random streams of the runs are derived from, a module-level
+      generator is used if None.
+
+    Returns:
+    - moisture_base: The baseline moisture level for each run (read-only view), shape (num_runs, n).
+    - noise: Noise values added to simulate randomness for each run.
+    - moisture_noisy: The simulated moisture with cumulative rain effect and noise for each run.
+    """
+
+    base_moisture, rain_impact, drying_speed, noise_level = _batch_parameters(
+        rain, base_moisture, rain_impact, drying_speed, noise_level)
+
+    # The base moisture level is constant in time, so broadcast each run's value
+    moisture_base = np.broadcast_to(base_moisture.astype(dtype)[:, np.newaxis],
+                                    (base_moisture.shape[0], np.shape(time)[0]))
+    # The noise and noisy signals are slices of a single contiguous buffer
+    noise, moisture_noisy = np.empty((2,) + moisture_base.shape, dtype=dtype)
+
+    # Moisture has no spikes
+    no_spikes = np.zeros_like(base_moisture)
+    _run_batch(rain, moisture_base, rain_impact, drying_speed, noise_level, no_spikes, no_spikes, rng, noise,
+               moisture_noisy)
+
+    return moisture_base, noise, moisture_noisy
+
+@lru_cache(maxsize=32)
+def _time_vector(duration, resolution, dtype):
+    # Number of time points including both endpoints
+    num_points = int(round(duration * 60.0 / resolution)) + 1
+    time = np.linspace(0.0, duration, num_points, dtype=np.float64).astype(dtype)
+    # The cached array is shared between calls, so protect it against modification
+    time.setflags(write=False)
+    # Register its arguments for the memoized daily cycles until it is garbage collected
+    _TIME_KEYS[id(time)] = (duration, resolution, dtype)
+    weakref.finalize(time, _TIME_KEYS.pop, id(time), None)
+    return time
+
+def generate_time_vector(duration, resolution, dtype=np.float64):
     """
     Generates a time vector for a given duration and resolution.
 
     Parameters:
     - duration: Duration of the time vector in hours.
     - resolution: Time resolution in minutes.
+    - dtype: Floating point type of the time points (float64 by default, also for float32 signals, so that the time
+      points printed and plotted stay exact).
 
     Returns:
-    - time: Array of time points in hours.
+    - time: Read-only array of time points in hours, shared between calls with the same arguments.
     """
 
     # Generate time points from 0 to duration with specified resolution
-    return np.arange(0, duration + resolution / 61, resolution / 60)
+    return _time_vector(duration, resolution, np.dtype(dtype))
 
-def generate_rain_vector(time, rain_probability, intensity):
+@njit(cache=True)
+def _fill_rain(rain_vector, rain_probability, intensity, draws):
     """
-    Generates a rain vector where rain occurs with a certain probability.
+    Fill a rain vector with a two-state (raining / dry) Markov chain.
 
     Parameters:
-    - time: Array of time points.
+    - rain_vector: Array of zeros to write the rain intensity into.
     - rain_probability: Probability of rain occurrence at each time step.
     - intensity: Rain intensity (can be binary or float for intensity variation).
-
-    Returns:
-    - rain_vector: Array representing rain occurrence/intensity at each time step.
+    - draws: Uniform random numbers in [0, 1), one per time step.
     """
 
-    # Initialize rain vector with zeros (no rain)
-    rain_vector = np.zeros_like(time)
+    n = rain_vector.shape[0]
     is_raining = False
 
     # Determine rain occurrence at each time step based on probability
-    for i in range(len(time)):
+    for i in range(n):
+        r = draws[i]
         if is_raining:
             # Continue raining with specified intensity
             rain_vector[i] = intensity
             # Stop rain based on probability
-            if np.random.rand() > rain_probability:
+            if r > rain_probability:
                 is_raining = False
         else:
             # Start rain based on probability
-            if np.random.rand() < rain_probability:
+            if r < rain_probability:
                 is_raining = True
                 rain_vector[i] = intensity
-                
+
+def generate_rain_vector(time, rain_probability, intensity, rng=None):
+    """
+    Generates a rain vector where rain occurs with a certain probability.
+
+    Parameters:
+    - time: Array of time points.
+    - rain_probability: Probability of rain occurrence at each time step.
+    - intensity: Rain intensity (can be binary or float for intensity variation).
+    - rng: Random generator (np.random.Generator) for the rain, a module-level generator is used if None.
+
+    Returns:
+    - rain_vector: Array representing rain occurrence/intensity at each time step.
+    """
+
+    # Initialize rain vector with zeros (no rain)
+    rain_vector = np.zeros_like(time)
+
+    # Determine rain occurrence at each time step from one uniform draw per time step
+    draws = (_RNG if rng is None else rng).random(rain_vector.shape[0])
+    fill_rain = _kernel('fill_rain', rain_vector.dtype, _fill_rain)
+    fill_rain(rain_vector, rain_probability, intensity, draws)
+
     return rain_vector
\ No newline at end of file
@@ -0,0 +1,21 @@
+import os
+
+from numba.pycc import CC
+
+from Signal_Models import _accumulate_rain, _fill_rain, _uniform_step
+
+# Ahead-of-time compilation of the signal kernels into the signal_kernels extension module, so that short runs do not
+# pay for JIT compilation on their first call. Build it once with: python Signal_Models_aot.py
+cc = CC('signal_kernels')
+# Place the extension next to Signal_Models so that it is found on import
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Export one version of each kernel per supported floating point type
+for name, float_type in (('float32', 'f4'), ('float64', 'f8')):
+    cc.export('accumulate_rain_' + name, f'void({float_type}[:], b1[:], f8, f8, {float_type}[:])')(
+        _accumulate_rain.py_func)
+    cc.export('fill_rain_' + name, f'void({float_type}[:], f8, f8, f8[:])')(_fill_rain.py_func)
+    cc.export('uniform_step_' + name, f'f8({float_type}[:], f8)')(_uniform_step.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,87 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+import numpy as np
+from libc.math cimport fabs, fmax
+
+# Cython build of the signal kernels for deployments without Numba. Build it once with: python build_kernels.py
+
+ctypedef fused floating_t:
+    float
+    double
+
+cdef void _accumulate_rain(const floating_t[:] base, const unsigned char[:] rain, double rain_impact,
+                           double drying_speed, floating_t[:] cumulative) noexcept nogil:
+    # Apply the cumulative effect of rain to a base signal, see Signal_Models._accumulate_rain
+    cdef Py_ssize_t i, n = base.shape[0]
+    cdef double carry
+    if n == 0:
+        return
+    # The cumulative value is carried in double precision and only rounded when storing
+    carry = base[0]
+    cumulative[0] = <floating_t>carry
+    for i in range(1, n):
+        if rain[i]:
+            # Increase during rain
+            carry += rain_impact
+        else:
+            # Gradually reduce when it's not raining, but not below the base value
+            carry = fmax(base[i], carry - drying_speed)
+        cumulative[i] = <floating_t>carry
+
+cdef void _fill_rain(floating_t[:] rain_vector, double rain_probability, double intensity,
+                     const double[:] draws) noexcept nogil:
+    # Fill a rain vector with a two-state (raining / dry) Markov chain, see Signal_Models._fill_rain
+    cdef Py_ssize_t i, n = rain_vector.shape[0]
+    cdef bint is_raining = False
+    for i in range(n):
+        if is_raining:
+            # Continue raining with specified intensity
+            rain_vector[i] = <floating_t>intensity
+            # Stop rain based on probability
+            if draws[i] > rain_probability:
+                is_raining = False
+        elif draws[i] < rain_probability:
+            # Start rain based on probability
+            is_raining = True
+            rain_vector[i] = <floating_t>intensity
+
+cdef double _uniform_step(const floating_t[:] time, double tolerance) noexcept nogil:
+    # Spacing of a uniformly sampled time vector, or zero if it is not uniform, see Signal_Models._uniform_step
+    cdef Py_ssize_t i, n = time.shape[0]
+    cdef double start = time[0]
+    cdef double step = (time[n-1] - start) / (n - 1)
+    for i in range(n):
+        if not fabs(time[i] - (start + i * step)) <= tolerance:
+            return 0.0
+    return step
+
+# One entry point per floating point type, named like the kernels of Signal_Models_aot.py
+
+def accumulate_rain_float32(const float[:] base, rain, double rain_impact, double drying_speed, float[:] cumulative):
+    cdef const unsigned char[:] rain_bytes = np.asarray(rain, dtype=bool).view(np.uint8)
+    with nogil:
+        _accumulate_rain(base, rain_bytes, rain_impact, drying_speed, cumulative)
+
+def accumulate_rain_float64(const double[:] base, rain, double rain_impact, double drying_speed, double[:] cumulative):
+    cdef const unsigned char[:] rain_bytes = np.asarray(rain, dtype=bool).view(np.uint8)
+    with nogil:
+        _accumulate_rain(base, rain_bytes, rain_impact, drying_speed, cumulative)
+
+def fill_rain_float32(float[:] rain_vector, double rain_probability, double intensity, const double[:] draws):
+    with nogil:
+        _fill_rain(rain_vector, rain_probability, intensity, draws)
+
+def fill_rain_float64(double[:] rain_vector, double rain_probability, double intensity, const double[:] draws):
+    with nogil:
+        _fill_rain(rain_vector, rain_probability, intensity, draws)
+
+def uniform_step_float32(const float[:] time, double tolerance):
+    cdef double step
+    with nogil:
+        step = _uniform_step(time, tolerance)
+    return step
+
+def uniform_step_float64(const double[:] time, double tolerance):
+    cdef double step
+    with nogil:
+        step = _uniform_step(time, tolerance)
+    return step
@@ -0,0 +1,11 @@
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# Build the Cython signal kernels (_signal_kernels) next to Signal_Models, for deployments that cannot use Numba.
+# Build them once with: python build_kernels.py
+extension = Extension('_signal_kernels', ['_signal_kernels.pyx'],
+                      extra_compile_args=['/O2'] if sys.platform == 'win32' else ['-O3'])
+
+setup(name='signal_kernels', ext_modules=cythonize([extension]), script_args=['build_ext', '--inplace'])
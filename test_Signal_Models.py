@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from Signal_Models import (_accumulate_rain, _accumulate_rain_scan, _evaluate_daily_cycle, _run_seeds,
+                           generate_rain_vector, generate_time_vector, simulate_humidity, simulate_humidity_batch,
+                           simulate_moisture, simulate_moisture_batch)
+
+class AccumulateRainScanTest(unittest.TestCase):
+    """
+    The NumPy scan used without Numba must match the accumulation loop of the other kernels.
+    """
+
+    def test_scan_matches_loop(self):
+        rng = np.random.default_rng(0)
+        time = np.linspace(0.0, 24.0 * 60, 43201)
+        for dtype in (np.float32, np.float64):
+            for rain_probability in (0.2, 0.5, 0.8):
+                with self.subTest(dtype=np.dtype(dtype).name, rain_probability=rain_probability):
+                    base = _evaluate_daily_cycle(time, 70, 10, dtype)
+                    rain = rng.random(time.shape[0]) < rain_probability
+                    loop = np.empty_like(base)
+                    scan = np.empty_like(base)
+                    _accumulate_rain(base, rain, 0.5, 0.2, loop)
+                    _accumulate_rain_scan(base, rain, 0.5, 0.2, scan)
+
+                    if dtype == np.float32:
+                        # Both round the same double precision value once
+                        np.testing.assert_array_max_ulp(scan, loop, maxulp=1)
+                    else:
+                        # Only the rounding of the running sum differs
+                        tolerance = time.shape[0] * np.finfo(dtype).eps * np.abs(loop).max()
+                        np.testing.assert_allclose(scan, loop, rtol=0.0, atol=tolerance)
+
+    def test_scan_empty(self):
+        for dtype in (np.float32, np.float64):
+            with self.subTest(dtype=np.dtype(dtype).name):
+                scan = np.empty(0, dtype=dtype)
+                _accumulate_rain_scan(np.empty(0, dtype=dtype), np.empty(0, dtype=bool), 0.5, 0.2, scan)
+                self.assertEqual(scan.shape, (0,))
+                # The simulators accept an empty time vector as well
+                for signal in (simulate_humidity(np.empty(0), np.empty(0), 70, 10, 0.5, 0.2, 6, 0.05, 15, dtype=dtype) +
+                               simulate_moisture(np.empty(0), np.empty(0), 25, 0.5, 0.2, 3, dtype=dtype)):
+                    self.assertEqual(signal.shape, (0,))
+
+class BatchSimulationTest(unittest.TestCase):
+    """
+    The batch simulators must broadcast their parameters per run and accumulate the rain like the single-run ones.
+    """
+
+    def setUp(self):
+        self.time = generate_time_vector(24, 2)
+        rng = np.random.default_rng(1)
+        self.rain = np.stack([generate_rain_vector(self.time, 0.2, 1, rng=rng) for _ in range(3)])
+
+    def test_shapes(self):
+        n = self.time.shape[0]
+        for dtype in (np.float32, np.float64):
+            with self.subTest(dtype=np.dtype(dtype).name):
+                # A shared rain vector and scalar parameters give a single run
+                signals = simulate_humidity_batch(self.time, self.rain[0], 70, 10, 0.5, 0.2, 6, 0.05, 15, dtype=dtype)
+                for signal in signals:
+                    self.assertEqual(signal.shape, (1, n))
+                    self.assertEqual(signal.dtype, dtype)
+                # The number of runs follows from per-run parameters or from per-run rain
+                signals = simulate_humidity_batch(self.time, self.rain[0], [70, 60], 10, 0.5, 0.2, 6, 0.05, 15,
+                                                  dtype=dtype)
+                self.assertEqual(signals[2].shape, (2, n))
+                signals = simulate_moisture_batch(self.time, self.rain, 25, 0.5, 0.2, 3, dtype=dtype)
+                for signal in signals:
+                    self.assertEqual(signal.shape, (3, n))
+                    self.assertEqual(signal.dtype, dtype)
+
+    def test_mismatched_runs(self):
+        with self.assertRaises(ValueError):
+            simulate_moisture_batch(self.time, self.rain, [25, 30], 0.5, 0.2, 3)
+
+    def test_per_run_parameters(self):
+        base, _, _ = simulate_humidity_batch(self.time, self.rain[0], [70, 60], [10, 5], 0.5, 0.2, 6, 0.05, 15,
+                                             dtype=np.float64)
+        np.testing.assert_allclose(base[0], _evaluate_daily_cycle(self.time, 70, 10, np.float64))
+        np.testing.assert_allclose(base[1], _evaluate_daily_cycle(self.time, 60, 5, np.float64))
+
+    def test_matches_single_runs(self):
+        # Without noise, each run is the rain accumulation of its own parameters and rain vector
+        for dtype in (np.float32, np.float64):
+            with self.subTest(dtype=np.dtype(dtype).name):
+                _, _, batch = simulate_moisture_batch(self.time, self.rain, [25, 30, 35], [0.5, 1.0, 0.2], 0.2, 0,
+                                                      dtype=dtype)
+                for k, (base_moisture, rain_impact) in enumerate(zip([25, 30, 35], [0.5, 1.0, 0.2])):
+                    _, _, single = simulate_moisture(self.time, self.rain[k], base_moisture, rain_impact, 0.2, 0,
+                                                     dtype=dtype)
+                    np.testing.assert_array_max_ulp(batch[k], single, maxulp=1)
+
+                _, _, batch = simulate_humidity_batch(self.time, self.rain[0], 70, 10, 0.5, 0.2, 0, 0, 15,
+                                                      dtype=dtype)
+                _, _, single = simulate_humidity(self.time, self.rain[0], 70, 10, 0.5, 0.2, 0, 0, 15, dtype=dtype)
+                np.testing.assert_array_max_ulp(batch[0], single, maxulp=1)
+
+    def test_reproducible(self):
+        first = simulate_humidity_batch(self.time, self.rain, 70, 10, 0.5, 0.2, 6, 0.05, 15,
+                                        rng=np.random.default_rng(2))
+        second = simulate_humidity_batch(self.time, self.rain, 70, 10, 0.5, 0.2, 6, 0.05, 15,
+                                         rng=np.random.default_rng(2))
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+        # Every run has its own random stream
+        self.assertFalse(np.array_equal(first[1][0], first[1][1]))
+
+    def test_distinct_seeds(self):
+        # Independent draws would collide in large sweeps, the runs of a batch must never share a seed
+        seeds = _run_seeds(np.random.default_rng(0), 100000)
+        self.assertEqual(np.unique(seeds).shape[0], seeds.shape[0])
+
+if __name__ == '__main__':
+    unittest.main()